@@ -1,227 +1,554 @@
-"""
-Logging configuration for the FastAPI Calculator Application.
-
-This module provides centralized logging configuration that can be imported
-and used across the application. It sets up different log levels for different
-environments and provides structured logging capabilities.
-"""
-
-import logging
-import logging.handlers
-import sys
-import os
-from datetime import datetime
-from typing import Optional
-
-
-class ColoredFormatter(logging.Formatter):
-    """Custom formatter that adds colors to log levels for better readability."""
-    
-    # ANSI color codes
-    COLORS = {
-        'DEBUG': '\033[36m',    # Cyan
-        'INFO': '\033[32m',     # Green
-        'WARNING': '\033[33m',  # Yellow
-        'ERROR': '\033[31m',    # Red
-        'CRITICAL': '\033[35m', # Magenta
-        'RESET': '\033[0m'      # Reset
-    }
-    
-    def format(self, record):
-        # Add color to the level name
-        if record.levelname in self.COLORS:
-            record.levelname = f"{self.COLORS[record.levelname]}{record.levelname}{self.COLORS['RESET']}"
-        return super().format(record)
-
-
-def setup_logging(
-    log_level: str = "INFO",
-    log_file: Optional[str] = None,
-    max_file_size: int = 10 * 1024 * 1024,  # 10MB
-    backup_count: int = 5,
-    enable_colors: bool = True
-) -> logging.Logger:
-    """
-    Set up comprehensive logging configuration for the application.
-    
-    Parameters:
-    -----------
-    log_level : str, optional
-        The logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL). Default is INFO.
-    log_file : str, optional
-        Path to the log file. If None, only console logging is enabled.
-    max_file_size : int, optional
-        Maximum size of each log file before rotation. Default is 10MB.
-    backup_count : int, optional
-        Number of backup files to keep. Default is 5.
-    enable_colors : bool, optional
-        Whether to enable colored console output. Default is True.
-    
-    Returns:
-    --------
-    logging.Logger
-        The configured root logger.
-    """
-    # Create logs directory if it doesn't exist
-    if log_file:
-        os.makedirs(os.path.dirname(log_file), exist_ok=True)
-    
-    # Configure root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(getattr(logging, log_level.upper()))
-    
-    # Clear existing handlers
-    root_logger.handlers.clear()
-    
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    
-    if enable_colors:
-        console_formatter = ColoredFormatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-    else:
-        console_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-    
-    console_handler.setFormatter(console_formatter)
-    root_logger.addHandler(console_handler)
-    
-    # File handler (if log_file is provided)
-    if log_file:
-        # Main application log file
-        file_handler = logging.handlers.RotatingFileHandler(
-            log_file,
-            maxBytes=max_file_size,
-            backupCount=backup_count,
-            encoding='utf-8'
-        )
-        file_handler.setLevel(logging.DEBUG)
-        
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        file_handler.setFormatter(file_formatter)
-        root_logger.addHandler(file_handler)
-        
-        # Error log file
-        error_log_file = log_file.replace('.log', '_error.log')
-        error_handler = logging.handlers.RotatingFileHandler(
-            error_log_file,
-            maxBytes=max_file_size,
-            backupCount=backup_count,
-            encoding='utf-8'
-        )
-        error_handler.setLevel(logging.ERROR)
-        error_handler.setFormatter(file_formatter)
-        root_logger.addHandler(error_handler)
-    
-    # Set specific logger levels
-    logging.getLogger('uvicorn').setLevel(logging.INFO)
-    logging.getLogger('uvicorn.access').setLevel(logging.INFO)
-    logging.getLogger('fastapi').setLevel(logging.INFO)
-    logging.getLogger('httpx').setLevel(logging.WARNING)
-    
-    return root_logger
-
-
-def get_logger(name: str) -> logging.Logger:
-    """
-    Get a logger instance with the specified name.
-    
-    Parameters:
-    -----------
-    name : str
-        The name of the logger (typically __name__).
-    
-    Returns:
-    --------
-    logging.Logger
-        A logger instance configured with the application's logging settings.
-    """
-    return logging.getLogger(name)
-
-
-# Environment-specific logging configurations
-def setup_development_logging():
-    """Set up logging for development environment."""
-    return setup_logging(
-        log_level="DEBUG",
-        log_file="logs/app.log",
-        enable_colors=True
-    )
-
-
-def setup_production_logging():
-    """Set up logging for production environment."""
-    return setup_logging(
-        log_level="INFO",
-        log_file="logs/app.log",
-        enable_colors=False
-    )
-
-
-def setup_test_logging():
-    """Set up logging for testing environment."""
-    return setup_logging(
-        log_level="WARNING",
-        log_file=None,
-        enable_colors=False
-    )
-
-
-# Structured logging helpers
-class StructuredLogger:
-    """Helper class for structured logging with context."""
-    
-    def __init__(self, logger: logging.Logger):
-        self.logger = logger
-    
-    def log_operation(self, operation: str, a: float, b: float, result: float, 
-                     duration_ms: Optional[float] = None):
-        """Log an arithmetic operation with structured data."""
-        context = {
-            "operation": operation,
-            "operand_a": a,
-            "operand_b": b,
-            "result": result,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        if duration_ms is not None:
-            context["duration_ms"] = duration_ms
-        
-        self.logger.info(f"Operation completed: {operation}", extra=context)
-    
-    def log_error(self, operation: str, error: str, context: Optional[dict] = None):
-        """Log an error with structured context."""
-        error_context = {
-            "operation": operation,
-            "error": error,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        if context:
-            error_context.update(context)
-        
-        self.logger.error(f"Operation failed: {operation} - {error}", extra=error_context)
-    
-    def log_request(self, method: str, path: str, client_ip: str, 
-                   user_agent: Optional[str] = None):
-        """Log an incoming request."""
-        request_context = {
-            "method": method,
-            "path": path,
-            "client_ip": client_ip,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        if user_agent:
-            request_context["user_agent"] = user_agent
-        
-        self.logger.info(f"Request received: {method} {path}", extra=request_context)
+"""
+Logging configuration for the FastAPI Calculator Application.
+
+This module provides centralized logging configuration that can be imported
+and used across the application. It sets up different log levels for different
+environments and provides structured logging capabilities.
+"""
+
+import atexit
+import functools
+import logging
+import logging.handlers
+import queue
+import sys
+import os
+import threading
+import time
+from typing import Callable, Final, Optional
+
+import orjson
+
+# Bound once so the structured-logging hot path skips the module attribute
+# lookup per call
+_encode = orjson.dumps
+
+# Listener that services the logging queue on a background thread.
+# Populated by setup_logging and stopped by shutdown_logging.
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+# Log-level names resolved once at import; a typo in a config value fails
+# fast with KeyError instead of getattr silently misbehaving
+_LEVELS: Final[dict[str, int]] = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+# Per-library levels applied by setup_logging in one pass; built once at
+# import so repeated setup calls (tests, reloads) reuse the same table.
+_LIBRARY_LEVELS: Final[dict[str, int]] = {
+    'uvicorn': logging.INFO,
+    'uvicorn.access': logging.INFO,
+    'fastapi': logging.INFO,
+    'httpx': logging.WARNING,
+}
+
+
+class ColoredFormatter(logging.Formatter):
+    """Custom formatter that adds colors to log levels for better readability."""
+
+    # ANSI color codes
+    COLORS = {
+        'DEBUG': '\033[36m',    # Cyan
+        'INFO': '\033[32m',     # Green
+        'WARNING': '\033[33m',  # Yellow
+        'ERROR': '\033[31m',    # Red
+        'CRITICAL': '\033[35m', # Magenta
+        'RESET': '\033[0m'      # Reset
+    }
+
+    # Colored level names, rendered once at class definition rather than
+    # per record
+    COLORED_LEVELS = {
+        level: f"{color}{level}\033[0m"
+        for level, color in COLORS.items()
+        if level != 'RESET'
+    }
+
+    def format(self, record):
+        # Swap in the pre-rendered colored level name, restoring the original
+        # afterwards so handlers sharing this record see plain text
+        original = record.levelname
+        record.levelname = self.COLORED_LEVELS.get(original, original)
+        try:
+            return super().format(record)
+        finally:
+            record.levelname = original
+
+
+class OrjsonFormatter(logging.Formatter):
+    """
+    Formatter that renders each record as a single line of JSON via orjson.
+
+    orjson serializes in C without Python-level recursion, which makes it
+    2-3x faster than stdlib json for the small context dicts produced by
+    StructuredLogger. Any structured context attached to the record under
+    the 'context' attribute is merged into the JSON payload.
+    """
+
+    def format(self, record):
+        # StructuredLogger attaches an already-serialized NDJSON line; reuse
+        # it instead of rebuilding and re-encoding the payload
+        line = getattr(record, "ndjson", None)
+        if line is not None:
+            return line.decode()
+        payload = {
+            "ts": record.created,
+            "lvl": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        context = getattr(record, "context", None)
+        if context:
+            payload.update(context)
+        return orjson.dumps(
+            payload, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+        ).decode()
+
+
+class FastRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    RotatingFileHandler whose rollover check does not re-format the record.
+
+    The stdlib implementation formats the pending record inside
+    shouldRollover to estimate its size, so every emit pays for two
+    formatter passes. Checking the stream position against maxBytes is
+    enough here; a backup may exceed maxBytes by at most one record.
+    """
+
+    def shouldRollover(self, record):
+        return (
+            self.stream is not None
+            and self.maxBytes > 0
+            and self.stream.tell() >= self.maxBytes
+        )
+
+
+class BufferedRotatingFileHandler(FastRotatingFileHandler):
+    """
+    Rotating file handler that batches records before writing.
+
+    The stdlib StreamHandler issues one write-plus-flush per record, i.e.
+    one syscall per log call. This handler accumulates formatted records
+    in memory and writes them in a single pass when the buffer reaches
+    buffer_size bytes or when flush_interval seconds elapse, whichever
+    comes first. Flush triggers: buffer full, interval timer, explicit
+    flush()/close(), and interpreter exit (via the module's shutdown
+    hook), so records are not lost at shutdown.
+    """
+
+    def __init__(self, filename, mode='a', maxBytes=0, backupCount=0,
+                 encoding=None, delay=False, buffer_size=8192,
+                 flush_interval=1.0):
+        super().__init__(filename, mode=mode, maxBytes=maxBytes,
+                         backupCount=backupCount, encoding=encoding,
+                         delay=delay)
+        self._buffer = []
+        self._buffered_chars = 0
+        self._buffer_size = buffer_size
+        self._flush_interval = flush_interval
+        self._flush_timer = None
+        # Cached file size so the rollover check needs no per-emit stream
+        # query (the stdlib stats the file on every record, which on NFS is
+        # a full network round-trip)
+        self._size = self.stream.tell() if self.stream else 0
+
+    def shouldRollover(self, record):
+        return self.maxBytes > 0 and self._size >= self.maxBytes
+
+    def emit(self, record):
+        try:
+            msg = self.format(record) + self.terminator
+            self.acquire()
+            try:
+                if self.shouldRollover(record):
+                    self._drain()
+                    self.doRollover()
+                self._buffer.append(msg)
+                self._buffered_chars += len(msg)
+                self._size += len(msg)
+                if self._buffered_chars >= self._buffer_size:
+                    self._drain()
+                elif self._flush_timer is None:
+                    # First record since the last drain: schedule a flush so
+                    # a quiet period cannot strand buffered records
+                    self._flush_timer = threading.Timer(
+                        self._flush_interval, self.flush
+                    )
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
+            finally:
+                self.release()
+        except Exception:
+            self.handleError(record)
+
+    def _drain(self):
+        """Write buffered records in one pass. Caller must hold the lock."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._buffer:
+            return
+        if self.stream is None:
+            self.stream = self._open()
+        self.stream.write(''.join(self._buffer))
+        self._buffer.clear()
+        self._buffered_chars = 0
+
+    def doRollover(self):
+        super().doRollover()
+        # Fresh file after rotation: reset the cached size
+        self._size = 0
+
+    def flush(self):
+        self.acquire()
+        try:
+            self._drain()
+            super().flush()
+        finally:
+            self.release()
+
+    def close(self):
+        self.flush()
+        super().close()
+
+
+def setup_logging(
+    log_level: str = "INFO",
+    log_file: Optional[str] = None,
+    max_file_size: int = 10 * 1024 * 1024,  # 10MB
+    backup_count: int = 5,
+    enable_colors: bool = True,
+    handler_factory: Optional[Callable[[], logging.Handler]] = None
+) -> logging.Logger:
+    """
+    Set up comprehensive logging configuration for the application.
+    
+    Parameters:
+    -----------
+    log_level : str, optional
+        The logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL). Default is INFO.
+    log_file : str, optional
+        Path to the log file. If None, only console logging is enabled.
+    max_file_size : int, optional
+        Maximum size of each log file before rotation. Default is 10MB.
+    backup_count : int, optional
+        Number of backup files to keep. Default is 5.
+    enable_colors : bool, optional
+        Whether to enable colored console output. Default is True.
+    handler_factory : callable, optional
+        Factory returning a handler to use in place of the rotating file
+        handlers. Intended for tests that want an in-memory sink instead
+        of disk I/O; ignored when None.
+    
+    Returns:
+    --------
+    logging.Logger
+        The configured root logger.
+    """
+    global _queue_listener
+
+    # Resolve the log path once and create its directory if needed. A bare
+    # filename would make os.path.dirname return '' (which makedirs rejects),
+    # and an absolute path spares the handler repeated CWD resolution on
+    # every rotation check.
+    if log_file:
+        log_dir = os.path.dirname(os.path.abspath(log_file))
+        os.makedirs(log_dir, exist_ok=True)
+        log_file = os.path.join(log_dir, os.path.basename(log_file))
+
+    # Stop any listener left over from a previous setup_logging call and
+    # close its handlers, so repeated setups (tests, environment switches)
+    # do not leak file descriptors
+    shutdown_logging()
+
+    # Configure root logger
+    root_logger = logging.getLogger()
+    root_logger.setLevel(_LEVELS[log_level.upper()])
+
+    # Clear existing handlers
+    root_logger.handlers.clear()
+
+    # Handlers serviced by the queue listener (not attached to the root logger
+    # directly, so request threads only pay for an enqueue per record)
+    queued_handlers = []
+
+    # Console handler. Reopen stdout line-buffered UTF-8 first so each record
+    # costs a single write syscall with no per-write codec negotiation, even
+    # when stdout is a block-buffered pipe (e.g. under uvicorn or docker).
+    # Guarded because test harnesses may swap in streams without reconfigure.
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(
+            encoding="utf-8", line_buffering=True, write_through=True
+        )
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(logging.INFO)
+    
+    if enable_colors:
+        console_formatter = ColoredFormatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+    else:
+        console_formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+    
+    console_handler.setFormatter(console_formatter)
+    queued_handlers.append(console_handler)
+    
+    # Detailed formatter shared by file-style handlers
+    file_formatter = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+    if handler_factory is not None:
+        # Dependency-injection hook: the injected handler (typically an
+        # in-memory StreamHandler in tests) stands in for the rotating
+        # file pair, so no disk I/O happens at all
+        injected_handler = handler_factory()
+        injected_handler.setLevel(logging.DEBUG)
+        if injected_handler.formatter is None:
+            injected_handler.setFormatter(file_formatter)
+        queued_handlers.append(injected_handler)
+    # File handler (if log_file is provided)
+    elif log_file:
+        # Main application log file
+        file_handler = BufferedRotatingFileHandler(
+            log_file,
+            maxBytes=max_file_size,
+            backupCount=backup_count,
+            encoding='utf-8'
+        )
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(OrjsonFormatter())
+        queued_handlers.append(file_handler)
+        
+        # Error log file
+        error_log_file = log_file.replace('.log', '_error.log')
+        error_handler = FastRotatingFileHandler(
+            error_log_file,
+            maxBytes=max_file_size,
+            backupCount=backup_count,
+            encoding='utf-8'
+        )
+        error_handler.setLevel(logging.ERROR)
+        error_handler.setFormatter(file_formatter)
+        queued_handlers.append(error_handler)
+
+    # Route all records through a queue so the calling thread only enqueues;
+    # the listener thread does the formatting and I/O in the background.
+    log_queue = queue.Queue(-1)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, *queued_handlers, respect_handler_level=True
+    )
+    _queue_listener.start()
+
+    # Set specific logger levels from the module-level table
+    for lib_name, lib_level in _LIBRARY_LEVELS.items():
+        logging.getLogger(lib_name).setLevel(lib_level)
+    
+    return root_logger
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Get a logger instance with the specified name.
+    
+    Parameters:
+    -----------
+    name : str
+        The name of the logger (typically __name__).
+    
+    Returns:
+    --------
+    logging.Logger
+        A logger instance configured with the application's logging settings.
+    """
+    return logging.getLogger(name)
+
+
+def flush_logging() -> None:
+    """
+    Block until every queued log record has been handled and flushed.
+
+    Useful in tests (and at shutdown) where output must be visible before
+    the caller continues, since handlers run on the listener thread.
+    """
+    if _queue_listener is not None:
+        _queue_listener.queue.join()
+        for handler in _queue_listener.handlers:
+            handler.flush()
+
+
+def shutdown_logging() -> None:
+    """
+    Stop the background queue listener, draining any pending records.
+
+    The listener's handlers are closed afterwards so their buffers reach
+    disk and their file descriptors are released. Intended to be called
+    from the application's shutdown hook so no log records are lost when
+    the process exits; setup_logging also calls it before installing a
+    new listener.
+    """
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        for handler in _queue_listener.handlers:
+            handler.close()
+        _queue_listener = None
+
+
+# One process-wide exit hook (rather than one atexit callback per handler
+# instance, which would pin every handler ever created for the life of
+# the process) flushes and closes whichever listener is active at exit.
+atexit.register(shutdown_logging)
+
+
+# Environment-specific logging configurations
+def setup_development_logging():
+    """Set up logging for development environment."""
+    return setup_logging(
+        log_level="DEBUG",
+        log_file="logs/app.log",
+        enable_colors=True
+    )
+
+
+def setup_production_logging():
+    """Set up logging for production environment."""
+    return setup_logging(
+        log_level="INFO",
+        log_file="logs/app.log",
+        enable_colors=False
+    )
+
+
+def setup_test_logging():
+    """Set up logging for testing environment."""
+    return setup_logging(
+        log_level="WARNING",
+        log_file=None,
+        enable_colors=False
+    )
+
+
+# Structured logging helpers
+class StructuredLogger:
+    """
+    Helper class for structured logging with context.
+
+    Each method pre-serializes its NDJSON line with orjson at call time
+    and attaches it to the record, so the file formatter can reuse the
+    already-serialized bytes instead of rebuilding and re-encoding the
+    payload per emit.
+    """
+
+    __slots__ = ("logger", "_info", "_error")
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        # Bind the hot logger methods once so each structured call skips the
+        # attribute lookup on the wrapped logger
+        self._info = logger.info
+        self._error = logger.error
+
+    def _line(self, level: str, msg: str, context: dict) -> bytes:
+        """Serialize one NDJSON log line for the given message and context."""
+        payload = {
+            "ts": time.time(),
+            "lvl": level,
+            "logger": self.logger.name,
+            "msg": msg,
+        }
+        payload.update(context)
+        return _encode(payload, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+    
+    def log_operation(self, operation: str, a: float, b: float, result: float, 
+                     duration_ms: Optional[float] = None):
+        """Log an arithmetic operation with structured data."""
+        # Skip context building and serialization when the record would be
+        # dropped anyway
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        # No explicit timestamp: LogRecord.created already carries epoch time
+        # and OrjsonFormatter emits it as the "ts" field
+        context = {
+            "operation": operation,
+            "operand_a": a,
+            "operand_b": b,
+            "result": result,
+        }
+        
+        if duration_ms is not None:
+            context["duration_ms"] = duration_ms
+        
+        # Nest the context under a single attribute so arbitrary keys cannot
+        # collide with reserved LogRecord attributes.
+        msg = f"Operation completed: {operation}"
+        self._info(
+            msg, extra={"context": context, "ndjson": self._line("INFO", msg, context)}
+        )
+    
+    def log_error(self, operation: str, error: str, context: Optional[dict] = None):
+        """Log an error with structured context."""
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
+        error_context = {
+            "operation": operation,
+            "error": error,
+        }
+        
+        if context:
+            error_context.update(context)
+        
+        msg = f"Operation failed: {operation} - {error}"
+        self._error(
+            msg,
+            extra={"context": error_context, "ndjson": self._line("ERROR", msg, error_context)},
+        )
+    
+    def log_request(self, method: str, path: str, client_ip: str, 
+                   user_agent: Optional[str] = None):
+        """Log an incoming request."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        request_context = {
+            "method": method,
+            "path": path,
+            "client_ip": client_ip,
+        }
+        
+        if user_agent:
+            request_context["user_agent"] = user_agent
+        
+        msg = f"Request received: {method} {path}"
+        self._info(
+            msg,
+            extra={"context": request_context, "ndjson": self._line("INFO", msg, request_context)},
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def get_structured_logger(name: str) -> StructuredLogger:
+    """
+    Get a cached StructuredLogger wrapping the named logger.
+
+    Parameters:
+    -----------
+    name : str
+        The name of the underlying logger (typically __name__).
+
+    Returns:
+    --------
+    StructuredLogger
+        The same wrapper instance for repeated calls with the same name,
+        so its bound-method caches stay warm.
+    """
+    return StructuredLogger(logging.getLogger(name))
@@ -24,6 +24,13 @@ import logging
 # Setup logger for operations module
 logger = logging.getLogger(__name__)
 
+# Bind the hot logger methods once at import so each arithmetic call skips
+# the per-call attribute lookup on the module-level logger
+_debug = logger.debug
+_info = logger.info
+_error = logger.error
+_enabled = logger.isEnabledFor
+
 # Define a type alias for numbers that can be either int or float
 Number = Union[int, float]
 
@@ -44,15 +51,12 @@ def add(a: Number, b: Number) -> Number:
     >>> add(2.5, 3)
     5.5
     """
-    logger.debug(f"Adding {a} + {b}")
-    try:
-        # Perform addition of a and b
-        result = a + b
-        logger.info(f"Addition successful: {a} + {b} = {result}")
-        return result
-    except Exception as e:  # pragma: no cover
-        logger.error(f"Addition failed for {a} + {b}: {str(e)}")    # pragma: no cover
-        raise   # pragma: no cover
+    if _enabled(logging.DEBUG):
+        _debug("Adding %s + %s", a, b)
+    # Perform addition of a and b (cannot raise for numeric inputs)
+    result = a + b
+    _info("Addition successful: %s + %s = %s", a, b, result)
+    return result
 
 def subtract(a: Number, b: Number) -> Number:
     """
@@ -71,15 +75,12 @@ def subtract(a: Number, b: Number) -> Number:
     >>> subtract(5.5, 2)
     3.5
     """
-    logger.debug(f"Subtracting {a} - {b}")
-    try:
-        # Perform subtraction of b from a
-        result = a - b
-        logger.info(f"Subtraction successful: {a} - {b} = {result}")
-        return result
-    except Exception as e:  # pragma: no cover
-        logger.error(f"Subtraction failed for {a} - {b}: {str(e)}")  # pragma: no cover
-        raise  # pragma: no cover
+    if _enabled(logging.DEBUG):
+        _debug("Subtracting %s - %s", a, b)
+    # Perform subtraction of b from a (cannot raise for numeric inputs)
+    result = a - b
+    _info("Subtraction successful: %s - %s = %s", a, b, result)
+    return result
 
 def multiply(a: Number, b: Number) -> Number:
     """
@@ -98,15 +99,12 @@ def multiply(a: Number, b: Number) -> Number:
     >>> multiply(2.5, 4)
     10.0
     """
-    logger.debug(f"Multiplying {a} * {b}")
-    try:
-        # Perform multiplication of a and b
-        result = a * b
-        logger.info(f"Multiplication successful: {a} * {b} = {result}")
-        return result
-    except Exception as e:  # pragma: no cover
-        logger.error(f"Multiplication failed for {a} * {b}: {str(e)}")  # pragma: no cover
-        raise  # pragma: no cover
+    if _enabled(logging.DEBUG):
+        _debug("Multiplying %s * %s", a, b)
+    # Perform multiplication of a and b (cannot raise for numeric inputs)
+    result = a * b
+    _info("Multiplication successful: %s * %s = %s", a, b, result)
+    return result
 
 def divide(a: Number, b: Number) -> float:
     """
@@ -132,21 +130,16 @@ def divide(a: Number, b: Number) -> float:
         ...
     ValueError: Cannot divide by zero!
     """
-    logger.debug(f"Dividing {a} / {b}")
-    try:
-        # Check if the divisor is zero to prevent division by zero
-        if b == 0:
-            logger.error(f"Division by zero attempted: {a} / {b}")
-            # Raise a ValueError with a descriptive message
-            raise ValueError("Cannot divide by zero!")
-        
-        # Perform division of a by b and return the result as a float
-        result = a / b
-        logger.info(f"Division successful: {a} / {b} = {result}")
-        return result
-    except ValueError as ve:
-        logger.error(f"Division by zero error: {str(ve)}")
-        raise  # pragma: no cover
-    except Exception as e:  # pragma: no cover
-        logger.error(f"Division failed for {a} / {b}: {str(e)}")
-        raise  # pragma: no cover
+    if _enabled(logging.DEBUG):
+        _debug("Dividing %s / %s", a, b)
+    # Check if the divisor is zero to prevent division by zero
+    if b == 0:
+        _error("Division by zero attempted: %s / %s", a, b)
+        # Raise a ValueError with a descriptive message; the API layer maps
+        # it to a 400 response
+        raise ValueError("Cannot divide by zero!")
+
+    # Perform division of a by b and return the result as a float
+    result = a / b
+    _info("Division successful: %s / %s = %s", a, b, result)
+    return result
@@ -1,52 +1,154 @@
 # main.py
 
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.templating import Jinja2Templates
-from pydantic import BaseModel, Field, field_validator  # Use @validator for Pydantic 1.x
-from fastapi.exceptions import RequestValidationError
+from starlette.middleware.gzip import GZipMiddleware
+import hashlib
+from pydantic import BaseModel, ConfigDict, Field
 from app.operations import add, subtract, multiply, divide  # Ensure correct import path
+import asyncio
+import functools
+import msgspec
+import orjson
 import uvicorn
 import logging
+import os
 import sys
-from datetime import datetime
+import time
 import json
-from app.logger_module import setup_logging, get_logger, StructuredLogger
+from typing import Optional
+from app.logger_module import setup_logging, shutdown_logging, get_logger, StructuredLogger
 
-# Configure comprehensive logging
+# Configure comprehensive logging. setup_logging owns the root logger
+# outright (it clears any previously attached handlers), so nothing else --
+# logging.basicConfig included -- may add handlers, or every record would
+# be formatted and written twice.
 logger = setup_logging(
-    log_level="INFO",
-    log_file="logs/app.log",
+    log_level=os.getenv("LOG_LEVEL", "INFO"),
+    log_file=os.getenv("LOG_FILE", "logs/app.log"),
     enable_colors=True
 )
 structured_logger = StructuredLogger(logger)
 
 logger.info("FastAPI Calculator Application starting up...")
 
-app = FastAPI()
+async def stop_log_listener():
+    """Drain and stop the background logging queue listener on shutdown."""
+    shutdown_logging()
+
+# Completion log entries are funneled through an asyncio queue drained by a
+# background task, so the request path never touches the logging.Handler
+# lock. Created on startup; None until then (entries log synchronously).
+_request_log_queue: Optional[asyncio.Queue] = None
+_request_log_drain_task = None
+
+
+async def _drain_request_logs():
+    """Drain queued completion entries in opportunistic batches of 100."""
+    queue = _request_log_queue
+    log_info = logger.info
+    while True:
+        entries = [await queue.get()]
+        try:
+            while len(entries) < 100:
+                entries.append(queue.get_nowait())
+        except asyncio.QueueEmpty:
+            pass
+        for method, path, status, process_time in entries:
+            log_info(
+                "Request completed: %s %s - Status: %d - Time: %.2fms",
+                method, path, status, process_time,
+            )
+
+
+async def start_request_log_drain():
+    """Create the completion-log queue and start its drain task."""
+    global _request_log_queue, _request_log_drain_task
+    _request_log_queue = asyncio.Queue(maxsize=10_000)
+    _request_log_drain_task = asyncio.create_task(_drain_request_logs())
+
+
+async def stop_request_log_drain():
+    """Cancel the completion-log drain task."""
+    global _request_log_queue, _request_log_drain_task
+    if _request_log_drain_task is not None:
+        _request_log_drain_task.cancel()
+        _request_log_drain_task = None
+    _request_log_queue = None
+
 
 # Add request logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Middleware to log all incoming requests."""
-    start_time = datetime.utcnow()
-    
-    # Log the incoming request
-    client_ip = request.client.host if request.client else 'unknown'
-    user_agent = request.headers.get('user-agent', 'unknown')
-    structured_logger.log_request(request.method, str(request.url.path), client_ip, user_agent)
-    
-    # Process the request
-    response = await call_next(request)
-    
-    # Log the response
-    process_time = (datetime.utcnow() - start_time).total_seconds() * 1000
-    logger.info(f"Request completed: {request.method} {request.url.path} - Status: {response.status_code} - Time: {process_time:.2f}ms")
-    
-    return response
+class RequestLoggingMiddleware:
+    """
+    Pure ASGI middleware that logs every request and its completion.
+
+    Working directly with the ASGI scope avoids BaseHTTPMiddleware (which
+    FastAPI's @app.middleware("http") decorator wraps around the handler):
+    no Request/Response objects are allocated and no extra anyio task is
+    spawned per request. The user agent is read straight from the raw
+    (bytes, bytes) header list and the response status is captured by
+    wrapping `send`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter_ns()
+        method = scope["method"]
+        path = scope["path"]
+        if logger.isEnabledFor(logging.INFO):
+            client = scope.get("client")
+            client_ip = client[0] if client else 'unknown'
+            # Walk the raw header list for the one header we need and decode
+            # it only when a record will actually be emitted
+            user_agent = b'unknown'
+            for name, value in scope["headers"]:
+                if name == b"user-agent":
+                    user_agent = value
+                    break
+            structured_logger.log_request(
+                method, path, client_ip, user_agent.decode("latin-1")
+            )
 
-# Setup templates directory
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                # perf_counter_ns is a raw monotonic-clock read returning an
+                # int, with none of datetime/timedelta's object allocation
+                process_time = (time.perf_counter_ns() - start_time) / 1_000_000
+                queue = _request_log_queue
+                if queue is not None:
+                    try:
+                        # Non-blocking enqueue; drop the entry rather than
+                        # stall the response under overload
+                        queue.put_nowait(
+                            (method, path, message["status"], process_time)
+                        )
+                    except asyncio.QueueFull:
+                        pass
+                else:
+                    logger.info(
+                        "Request completed: %s %s - Status: %d - Time: %.2fms",
+                        method, path, message["status"], process_time,
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+# Setup templates directory. The homepage is fully static (no Jinja
+# expressions), so render it a single time at import instead of paying the
+# template lookup and render on every GET /.
 templates = Jinja2Templates(directory="templates")
+_INDEX_HTML = templates.get_template("index.html").render()
+# ETag computed once from the rendered page so repeat visits can be
+# answered with an empty 304 instead of re-sending the HTML
+_INDEX_ETAG = f'"{hashlib.md5(_INDEX_HTML.encode()).hexdigest()}"'
+_INDEX_HEADERS = {"Cache-Control": "public, max-age=3600", "ETag": _INDEX_ETAG}
 
 # Pydantic model for request data
 class OperationRequest(BaseModel):
@@ -65,12 +167,6 @@ class OperationRequest(BaseModel):
         The second number (operand) for the operation.
         Can be an integer or floating-point number.
     
-    Validators:
-    -----------
-    validate_numbers(cls, value)
-        Validates that both a and b are numeric values.
-        Raises ValueError if either value is not a number.
-    
     Examples:
     ---------
     Valid request:
@@ -79,43 +175,25 @@ class OperationRequest(BaseModel):
     Valid with floats:
     >>> request = OperationRequest(a=2.5, b=3.7)
     
-    Raises ValueError:
+    Raises ValidationError:
     >>> OperationRequest(a="not a number", b=5)
-    ValueError: Both a and b must be numbers.
-    
+    ValidationError: Input should be a valid number
+
     Notes:
     ------
     - Both fields are required (Field(...))
     - Accepts both integers and floats
-    - Validation ensures type safety before operations
+    - Pydantic's C-accelerated core rejects non-numeric input, so no
+      Python-level validator is needed
     """
+    # Frozen models take Pydantic's no-setter fast path and can be hashed;
+    # request/response instances are never mutated after construction, and
+    # extra='forbid' keeps stray keys out of the documented schema
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     a: float = Field(..., description="The first number")
     b: float = Field(..., description="The second number")
 
-    @field_validator('a', 'b')  # Correct decorator for Pydantic 1.x
-    def validate_numbers(cls, value):
-        """
-        Validate that input values are numeric.
-        
-        Parameters:
-        -----------
-        value : Any
-            The value to validate, which should be an integer or float.
-        
-        Returns:
-        --------
-        int or float
-            The validated numeric value.
-        
-        Raises:
-        -------
-        ValueError
-            If the value is not an integer or float.
-        """
-        if not isinstance(value, (int, float)):
-            raise ValueError('Both a and b must be numbers.')
-        return value
-
 # Pydantic model for successful response
 class OperationResponse(BaseModel):
     """
@@ -145,6 +223,8 @@ class OperationResponse(BaseModel):
     - Format: {"result": <numeric_value>}
     - Returned by all successful calculator endpoints
     """
+    model_config = ConfigDict(frozen=True)
+
     result: float = Field(..., description="The result of the operation")
 
 # Pydantic model for error response
@@ -176,10 +256,11 @@ class ErrorResponse(BaseModel):
     - Format: {"error": "<error_message>"}
     - Used by custom exception handlers
     """
+    model_config = ConfigDict(frozen=True)
+
     error: str = Field(..., description="Error message")
 
 # Custom Exception Handlers
-@app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """
     Handle HTTP exceptions and return standardized error responses.
@@ -197,7 +278,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     
     Returns:
     --------
-    JSONResponse
+    ORJSONResponse
         A JSON response containing:
         - error (str): The error message from the exception
     
@@ -206,47 +287,20 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     This handler logs all HTTPExceptions for monitoring and debugging purposes.
     """
     logger.error(f"HTTPException on {request.url.path}: {exc.detail}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"error": exc.detail},
     )
 
-@app.exception_handler(RequestValidationError)
-async def validation_exception_handler(request: Request, exc: RequestValidationError):
+async def healthz():
     """
-    Handle request validation errors and return user-friendly error messages.
-    
-    This custom exception handler intercepts Pydantic validation errors that occur
-    when request data doesn't match the expected schema. It formats all validation
-    errors into a readable message.
-    
-    Parameters:
-    -----------
-    request : Request
-        The FastAPI request object that caused the validation error.
-    exc : RequestValidationError
-        The validation error containing details about which fields failed validation.
-    
-    Returns:
-    --------
-    JSONResponse
-        A JSON response with status code 400 containing:
-        - error (str): A concatenated string of all validation errors
-    
-    Notes:
-    ------
-    This handler ensures that users receive clear, actionable error messages when
-    they submit invalid data to the API endpoints.
+    Lightweight readiness probe.
+
+    Returns a constant payload without touching templates or logging
+    context, so test fixtures and orchestrators can poll it cheaply.
     """
-    # Extracting error messages
-    error_messages = "; ".join([f"{err['loc'][-1]}: {err['msg']}" for err in exc.errors()])
-    logger.error(f"ValidationError on {request.url.path}: {error_messages}")
-    return JSONResponse(
-        status_code=400,
-        content={"error": error_messages},
-    )
+    return {"ok": True}
 
-@app.get("/")
 async def read_root(request: Request):
     """
     Serve the calculator homepage.
@@ -261,198 +315,254 @@ async def read_root(request: Request):
     
     Returns:
     --------
-    TemplateResponse
-        A Jinja2 template response containing the rendered index.html page.
-    
+    HTMLResponse
+        The index.html page, rendered once at startup, with Cache-Control
+        and ETag headers; a matching If-None-Match yields an empty 304.
+
     Examples:
     ---------
     Visiting http://localhost:8000/ will display the calculator web interface.
     """
-    try:
-        return templates.TemplateResponse("index.html", {"request": request})
-    except Exception as e:
-        logger.error(f"Failed to render homepage: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+    if request.headers.get("if-none-match") == _INDEX_ETAG:
+        return Response(status_code=304, headers=_INDEX_HEADERS)
+    return HTMLResponse(_INDEX_HTML, headers=_INDEX_HEADERS)
 
-@app.post("/add", response_model=OperationResponse, responses={400: {"model": ErrorResponse}})
-async def add_route(operation: OperationRequest):
+class OperationPayload(msgspec.Struct, forbid_unknown_fields=True):
     """
-    Add two numbers together.
-    
-    This endpoint performs addition of two numbers. It accepts both integers and floats,
-    and returns the sum. Handles large numbers and floating-point arithmetic.
-    
-    Parameters:
-    -----------
-    operation : OperationRequest
-        A request object containing:
-        - a (float): The first number to add
-        - b (float): The second number to add
-    
-    Returns:
-    --------
-    OperationResponse
-        A response object containing:
-        - result (float): The sum of a and b
-    
-    Raises:
-    -------
-    HTTPException (400)
-        If an error occurs during the addition operation.
-    
-    Examples:
-    ---------
-    Request: {"a": 10, "b": 5}
-    Response: {"result": 15}
-    
-    Request: {"a": 2.5, "b": 3.7}
-    Response: {"result": 6.2}
+    msgspec twin of OperationRequest used on the request hot path.
+
+    msgspec decodes and validates the two-float payload in a single C
+    call, several times faster than running the JSON through a Python
+    orchestration layer. OperationRequest remains the documented schema;
+    this struct is purely the wire-format decoder, and
+    forbid_unknown_fields keeps it in lockstep with the schema's
+    extra='forbid': stray keys are rejected with a 400 instead of
+    silently ignored.
     """
-    logger.info(f"Addition request: {operation.a} + {operation.b}")
-    try:
-        result = add(operation.a, operation.b)
-        structured_logger.log_operation("add", operation.a, operation.b, result)
-        return OperationResponse(result=result)
-    except Exception as e:
-        structured_logger.log_error("add", str(e), {"operand_a": operation.a, "operand_b": operation.b})
-        raise HTTPException(status_code=400, detail=str(e))
+    a: float
+    b: float
+
 
-@app.post("/subtract", response_model=OperationResponse, responses={400: {"model": ErrorResponse}})
-async def subtract_route(operation: OperationRequest):
+# Decoder and encoder instantiated once at import time
+_DECODE_OPERATION = msgspec.json.Decoder(OperationPayload).decode
+_ENCODE = msgspec.json.Encoder().encode
+
+async def msgspec_decode_exception_handler(request: Request, exc: msgspec.DecodeError):
     """
-    Subtract the second number from the first number.
-    
-    This endpoint performs subtraction of two numbers. It accepts both integers and floats,
-    and returns the difference (a - b). Handles large numbers and floating-point arithmetic.
-    
-    Parameters:
-    -----------
-    operation : OperationRequest
-        A request object containing:
-        - a (float): The number from which to subtract
-        - b (float): The number to subtract
-    
-    Returns:
-    --------
-    OperationResponse
-        A response object containing:
-        - result (float): The difference of a minus b
-    
-    Raises:
-    -------
-    HTTPException (400)
-        If an error occurs during the subtraction operation.
-    
-    Examples:
-    ---------
-    Request: {"a": 10, "b": 5}
-    Response: {"result": 5}
-    
-    Request: {"a": 5.5, "b": 2.5}
-    Response: {"result": 3.0}
+    Handle malformed or invalid operation payloads decoded by msgspec.
+
+    Covers both msgspec.DecodeError (malformed JSON) and its
+    msgspec.ValidationError subclass (wrong types/missing fields),
+    returning the same {"error": ...} shape as the other handlers.
     """
-    logger.info(f"Subtraction request: {operation.a} - {operation.b}")
-    try:
-        result = subtract(operation.a, operation.b)
-        structured_logger.log_operation("subtract", operation.a, operation.b, result)
-        return OperationResponse(result=result)
-    except Exception as e:
-        structured_logger.log_error("subtract", str(e), {"operand_a": operation.a, "operand_b": operation.b})
-        raise HTTPException(status_code=400, detail=str(e))
+    logger.error(f"DecodeError on {request.url.path}: {exc}")
+    return Response(
+        content=orjson.dumps({"error": str(exc)}),
+        media_type="application/json",
+        status_code=400,
+    )
 
-@app.post("/multiply", response_model=OperationResponse, responses={400: {"model": ErrorResponse}})
-async def multiply_route(operation: OperationRequest):
+# Dispatch table mapping operation names to their implementations.
+_OPS = {
+    "add": add,
+    "subtract": subtract,
+    "multiply": multiply,
+    "divide": divide,
+}
+
+def _make_operation_route(op_name: str, op_func):
     """
-    Multiply two numbers together.
-    
-    This endpoint performs multiplication of two numbers. It accepts both integers and floats,
-    and returns the product. Handles large numbers and floating-point arithmetic.
-    
+    Generate a specialized route handler for one arithmetic operation.
+
+    Every hot reference -- the operation function, its display label, the
+    structured-logger methods, and the msgspec decoder/encoder -- is bound
+    into the closure, so the per-request bytecode uses LOAD_FAST locals
+    instead of repeated global and attribute lookups.
+
     Parameters:
     -----------
-    operation : OperationRequest
-        A request object containing:
-        - a (float): The first number to multiply
-        - b (float): The second number to multiply
-    
+    op_name : str
+        The operation name ("add", "subtract", "multiply", "divide"),
+        which also becomes the route path.
+    op_func : callable
+        The implementation from app.operations.
+
     Returns:
     --------
-    OperationResponse
-        A response object containing:
-        - result (float): The product of a and b
-    
-    Raises:
-    -------
-    HTTPException (400)
-        If an error occurs during the multiplication operation.
-    
-    Examples:
-    ---------
-    Request: {"a": 10, "b": 5}
-    Response: {"result": 50}
-    
-    Request: {"a": 2.5, "b": 4}
-    Response: {"result": 10.0}
+    coroutine function
+        The specialized handler to register with app.post.
     """
-    logger.info(f"Multiplication request: {operation.a} * {operation.b}")
-    try:
-        result = multiply(operation.a, operation.b)
-        structured_logger.log_operation("multiply", operation.a, operation.b, result)
-        return OperationResponse(result=result)
-    except Exception as e:
-        structured_logger.log_error("multiply", str(e), {"operand_a": operation.a, "operand_b": operation.b})
-        raise HTTPException(status_code=400, detail=str(e))
+    label = op_name.capitalize()
+    decode = _DECODE_OPERATION
+    encode = _ENCODE
+    log = logger
+    log_operation = structured_logger.log_operation
+    log_error = structured_logger.log_error
 
-@app.post("/divide", response_model=OperationResponse, responses={400: {"model": ErrorResponse}})
-async def divide_route(operation: OperationRequest):
+    async def operation_route(request: Request):
+        """
+        Perform the arithmetic operation on two numbers.
+
+        The JSON body is decoded and validated into an OperationPayload by
+        the msgspec decoder bound in the enclosing scope:
+        - a (float): The first operand
+        - b (float): The second operand
+
+        Returns a {"result": float} payload (documented via
+        OperationResponse), raising HTTPException 400 on operation errors
+        such as division by zero and 500 on unexpected failures.
+
+        Examples:
+        ---------
+        Request: POST /add {"a": 10, "b": 5}
+        Response: {"result": 15}
+
+        Request: POST /divide {"a": 10, "b": 0}
+        Response: 400 Error with "Cannot divide by zero!"
+        """
+        # Raises msgspec.DecodeError on bad input, handled above as a 400
+        operation = decode(await request.body())
+        if log.isEnabledFor(logging.INFO):
+            log.info("%s request: %s, %s", label, operation.a, operation.b)
+        try:
+            result = op_func(operation.a, operation.b)
+            if log.isEnabledFor(logging.INFO):
+                log_operation(op_name, operation.a, operation.b, result)
+            return Response(
+                content=encode({"result": result}), media_type="application/json"
+            )
+        except ValueError as e:
+            log_error(op_name, str(e), {"operand_a": operation.a, "operand_b": operation.b})
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            log_error(op_name, str(e), {"operand_a": operation.a, "operand_b": operation.b})
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+
+    operation_route.__name__ = f"{op_name}_route"
+    return operation_route
+
+class BatchOp(msgspec.Struct, forbid_unknown_fields=True):
     """
-    Divide the first number by the second number.
-    
-    This endpoint performs division of two numbers. It accepts both integers and floats,
-    and returns the quotient (a / b). Handles division by zero by returning an error.
-    
-    Parameters:
+    One operation in a /batch request.
+
+    Stray keys are rejected with a 400, the same contract
+    forbid_unknown_fields enforces for the single-operation payload.
+
+    Attributes:
     -----------
-    operation : OperationRequest
-        A request object containing:
-        - a (float): The dividend (number to be divided)
-        - b (float): The divisor (number to divide by)
-    
-    Returns:
-    --------
-    OperationResponse
-        A response object containing:
-        - result (float): The quotient of a divided by b
-    
-    Raises:
-    -------
-    HTTPException (400)
-        If the divisor is zero or an error occurs during division.
-    HTTPException (500)
-        If an unexpected internal server error occurs.
-    
+    op : str
+        The operation name ("add", "subtract", "multiply", "divide").
+    a : float
+        The first operand.
+    b : float
+        The second operand.
+    """
+    op: str
+    a: float
+    b: float
+
+
+# Decoder for the whole batch payload, instantiated once at import time
+_DECODE_BATCH = msgspec.json.Decoder(list[BatchOp]).decode
+
+async def batch_route(request: Request):
+    """
+    Perform a list of arithmetic operations in a single request.
+
+    Accepts a JSON array of {"op", "a", "b"} objects and returns
+    {"results": [...]} with one result per entry, in order. Clients with
+    many operations pay the request parse/middleware/serialize overhead
+    once for the whole batch instead of once per operation.
+
     Examples:
     ---------
-    Request: {"a": 10, "b": 2}
-    Response: {"result": 5.0}
-    
-    Request: {"a": 6.0, "b": 3.0}
-    Response: {"result": 2.0}
-    
-    Request: {"a": 10, "b": 0}
-    Response: 400 Error with "Cannot divide by zero!"
+    Request: POST /batch [{"op": "add", "a": 1, "b": 2}, {"op": "divide", "a": 6, "b": 3}]
+    Response: {"results": [3, 2.0]}
+
+    Raises HTTPException 400 on an unknown operation name or an operation
+    error such as division by zero.
     """
-    logger.info(f"Division request: {operation.a} / {operation.b}")
+    ops = _DECODE_BATCH(await request.body())
+    dispatch = _OPS
+    results = []
+    append = results.append
     try:
-        result = divide(operation.a, operation.b)
-        structured_logger.log_operation("divide", operation.a, operation.b, result)
-        return OperationResponse(result=result)
+        for entry in ops:
+            op_func = dispatch.get(entry.op)
+            if op_func is None:
+                raise HTTPException(
+                    status_code=400, detail=f"Unknown operation: {entry.op}"
+                )
+            append(op_func(entry.a, entry.b))
     except ValueError as e:
-        structured_logger.log_error("divide", str(e), {"operand_a": operation.a, "operand_b": operation.b})
         raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        structured_logger.log_error("divide", str(e), {"operand_a": operation.a, "operand_b": operation.b})
-        raise HTTPException(status_code=500, detail="Internal Server Error")
+    return Response(
+        content=_ENCODE({"results": results}), media_type="application/json"
+    )
+
+@functools.lru_cache(maxsize=1)
+def create_app() -> FastAPI:
+    """
+    Build and cache the fully configured FastAPI application.
+
+    All handlers are plain module-level coroutines; this factory wires
+    them to an app instance with orjson-backed responses, the logging and
+    gzip middlewares, and the exception handlers. The lru_cache guarantees
+    one app per process no matter how many callers import it (e.g. test
+    modules under pytest-xdist workers).
+    """
+    # orjson-backed responses: every JSON body the framework serializes
+    # goes through orjson's C encoder instead of stdlib json.dumps
+    application = FastAPI(default_response_class=ORJSONResponse)
+
+    application.add_event_handler("startup", start_request_log_drain)
+    application.add_event_handler("shutdown", stop_request_log_drain)
+    application.add_event_handler("shutdown", stop_log_listener)
+
+    # Deployments that need maximum throughput on the arithmetic routes
+    # can drop per-request logging entirely with REQUEST_LOGGING=0
+    if os.getenv("REQUEST_LOGGING", "1") != "0":
+        application.add_middleware(RequestLoggingMiddleware)
+    # Compress response bodies over 500 bytes (the homepage HTML shrinks
+    # several-fold on the wire)
+    application.add_middleware(GZipMiddleware, minimum_size=500)
+
+    # No RequestValidationError handler: every POST body goes through the
+    # msgspec decoders, so framework body validation never runs
+    application.add_exception_handler(HTTPException, http_exception_handler)
+    application.add_exception_handler(msgspec.DecodeError, msgspec_decode_exception_handler)
+
+    application.get("/healthz")(healthz)
+    application.get("/")(read_root)
+    # Register one specialized route per operation; the loop keeps the
+    # handlers DRY while each registered coroutine works purely on
+    # closure-bound locals
+    for op_name, op_func in _OPS.items():
+        application.post(
+            f"/{op_name}",
+            responses={200: {"model": OperationResponse}, 400: {"model": ErrorResponse}},
+        )(_make_operation_route(op_name, op_func))
+    application.post("/batch")(batch_route)
+
+    return application
+
+
+app = create_app()
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="127.0.0.1", port=8000)
+    if os.name != "nt":
+        # uvloop and httptools are C implementations of the event loop and
+        # HTTP parser (POSIX-only); multiple workers require passing the app
+        # as an import string. The access log is disabled because the request
+        # middleware already logs every request.
+        uvicorn.run(
+            "main:app",
+            host="127.0.0.1",
+            port=8000,
+            loop="uvloop",
+            http="httptools",
+            workers=os.cpu_count(),
+            access_log=False,
+        )
+    else:
+        uvicorn.run(app, host="127.0.0.1", port=8000, access_log=False)
@@ -6,6 +6,12 @@ import pytest
 from playwright.sync_api import sync_playwright
 import requests
 import logging
+
+# Preload the app packages once during conftest import so collecting the
+# test modules finds them already in sys.modules instead of re-running
+# the import machinery per file.
+import app.operations
+import app.logger_module
 #from tests.test_logger import setup_test_logging, setup_integration_test_logging, setup_e2e_test_logging
 
 
@@ -17,30 +23,49 @@ def fastapi_server():
     """
     logger = logging.getLogger(__name__)
     
-    # Start FastAPI app
+    # Start FastAPI app through the uvicorn CLI: same server stack as
+    # production (uvloop + httptools), without the uvicorn access log that
+    # would duplicate the app's own request-logging middleware
     logger.info("Starting FastAPI server for E2E tests...")
-    fastapi_process = subprocess.Popen(['python', 'main.py'])
+    fastapi_process = subprocess.Popen([
+        'uvicorn', 'main:app',
+        '--host', '127.0.0.1',
+        '--port', '8000',
+        '--loop', 'uvloop',
+        '--http', 'httptools',
+        '--no-access-log',
+    ])
     
-    # Define the URL to check if the server is up
-    server_url = 'http://127.0.0.1:8000/'
+    # Define the URL to check if the server is up. /healthz is served without
+    # template rendering, so polling it is cheap.
+    server_url = 'http://127.0.0.1:8000/healthz'
     
-    # Wait for the server to start by polling the root endpoint
+    # Wait for the server to start by polling the health endpoint with
+    # exponential backoff: fast first probes, capped at 0.5s between retries
     timeout = 30  # seconds
     start_time = time.time()
     server_up = False
+    delay = 0.05
     
     logger.info("Waiting for FastAPI server to start...")
     
-    while time.time() - start_time < timeout:
-        try:
-            response = requests.get(server_url)
-            if response.status_code == 200:
-                server_up = True
-                logger.info("FastAPI server is up and running.")
-                break
-        except requests.exceptions.ConnectionError:
-            pass
-        time.sleep(1)
+    # One session keeps the TCP connection warm across polls, and the short
+    # timeout keeps the loop responsive if the server hangs mid-start
+    session = requests.Session()
+    try:
+        while time.time() - start_time < timeout:
+            try:
+                response = session.get(server_url, timeout=0.25)
+                if response.status_code == 200:
+                    server_up = True
+                    logger.info("FastAPI server is up and running.")
+                    break
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                pass
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+    finally:
+        session.close()
     
     if not server_up:
         fastapi_process.terminate()
@@ -85,16 +110,45 @@ def browser(playwright_instance_fixture):
     browser.close()
 
 
+@pytest.fixture(scope="session")
+def context(browser):
+    """
+    Fixture to share one browser context across the whole test session.
+
+    Creating a context per test costs hundreds of milliseconds; the
+    calculator tests are stateless, so every page can come from the same
+    warm context.
+    """
+    logger = logging.getLogger(__name__)
+    logger.info("Creating shared browser context...")
+
+    context = browser.new_context()
+    # The calculator page is self-contained HTML/JS (inline styles and
+    # script); abort image/font/stylesheet/media requests such as the
+    # favicon before they hit the network
+    _SKIPPED_RESOURCES = {"image", "font", "stylesheet", "media"}
+    context.route(
+        "**/*",
+        lambda route: route.abort()
+        if route.request.resource_type in _SKIPPED_RESOURCES
+        else route.continue_(),
+    )
+    yield context
+
+    logger.info("Closing shared browser context...")
+    context.close()
+
+
 @pytest.fixture(scope="function")
-def page(browser):
+def page(context):
     """
-    Fixture to create a new page for each test.
+    Fixture to create a new page for each test from the shared context.
     """
     logger = logging.getLogger(__name__)
     logger.debug("Creating new browser page...")
-    
-    page = browser.new_page()
+
+    page = context.new_page()
     yield page
-    
+
     logger.debug("Closing browser page...")
     page.close()
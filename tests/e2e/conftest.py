@@ -0,0 +1,23 @@
+# tests/e2e/conftest.py
+
+import logging
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def warm_browser(context, fastapi_server):
+    """
+    Warm up the browser and server before the first E2E test runs.
+
+    The first navigation otherwise pays browser cold-start (one to a few
+    seconds), skewing that test's timing. Triggering a throwaway page load
+    during session setup moves the cost into fixture setup; under
+    pytest-xdist this runs once per worker. Scoped to the e2e directory so
+    unit and integration runs never launch a browser.
+    """
+    logger = logging.getLogger(__name__)
+    logger.info("Warming up browser with an initial page load...")
+
+    page = context.new_page()
+    page.goto('http://localhost:8000')
+    page.close()
@@ -1,6 +1,7 @@
 # tests/e2e/test_e2e.py
 
 import pytest  # Import the pytest framework for writing and running tests
+from playwright.sync_api import expect  # Auto-waiting, event-driven assertions
 
 # The following decorators and functions define E2E tests for the FastAPI calculator application.
 
@@ -15,7 +16,7 @@ def test_hello_world(page, fastapi_server):
     """
     # Navigate the browser to the homepage URL of the FastAPI application.
     page.goto('http://localhost:8000')
-    
+
     # Use an assertion to check that the text within the first <h1> tag is exactly "Hello World".
     # If the text does not match, the test will fail.
     assert page.inner_text('h1') == 'Hello World'
@@ -23,239 +24,121 @@ def test_hello_world(page, fastapi_server):
 
 
 # ---------------------------------------------
-# Parametrized E2E Tests for Calculator Operations
+# Table-Driven E2E Test for Calculator Operations
 # ---------------------------------------------
 
-@pytest.mark.e2e
-@pytest.mark.parametrize(
-    "a, b, expected",
-    [
-        ("2", "3", "5"),
-        ("-2", "-3", "-5"),
-        ("2.5", "3.5", "6.0"),
-        ("-2.5", "3.5", "1.0"),
-        ("0", "0", "0"),
-        ("1000000000", "2000000000", "3000000000"),
-        ("-1000000000", "-2000000000", "-3000000000"),
-        ("0.1", "0.2", "0.3"),
-        ("0.7", "0.1", "0.8"),
-    ],
-    ids=[
-        "add_pos_integers",
-        "add_neg_integers",
-        "add_pos_floats",
-        "add_neg_pos_float",
-        "add_zeros",
-        "add_large_integers",
-        "add_large_neg_integers",
-        "add_decimal_0.1_0.2",
-        "add_decimal_0.7_0.1",
-    ]
-)
-def test_calculator_add_parametrized(page, fastapi_server, a, b, expected):
-    """
-    Test the addition functionality of the calculator.
-
-    This test simulates a user performing an addition operation using the calculator
-    on the frontend. It fills in two numbers, clicks the "Add" button, and verifies
-    that the result displayed is correct.
-    """
-     # Navigate the browser to the homepage URL of the FastAPI application.
-    page.goto('http://localhost:8000')
-    # Fill in the first number input field (with id 'a') with the value 'a'.
-    page.fill('#a', a)
-    # Fill in the second number input field (with id 'b') with the value 'b'.
-    page.fill('#b', b)
-    # Click the button that has the exact text "Add". This triggers the addition operation.
-    page.click('button:text("Add")')
-    
-    # Wait for result to be displayed
-    page.wait_for_function("document.querySelector('#result').innerText.trim() !== ''")
-
-    # Get the text within the result div (with id 'result').
-    result_text = page.inner_text('#result')
-    # Extract just the number part (remove "Calculation Result: ")
-    result_value = result_text.replace('Calculation Result: ', '')
-    # Convert to float for comparison to handle precision
-    actual = float(result_value)
-    # Convert to float for comparison to handle precision
-    expected_float = float(expected)
-    # Use tolerance for floating point comparisons
-    assert abs(actual - expected_float) < 1e-10 or actual == expected_float, \
-        f"Expected {expected_float}, but got {actual}"
-
-
-@pytest.mark.e2e
-@pytest.mark.parametrize(
-    "a, b, expected",
-    [
-        ("5", "3", "2"),
-        ("-5", "-3", "-2"),
-        ("5.5", "2.5", "3.0"),
-        ("-5.5", "-2.5", "-3.0"),
-        ("0", "0", "0"),
-        ("1000000000000", "500000000000", "500000000000"),
-        ("-1000000000000", "-500000000000", "-500000000000"),
-        ("0.123456789", "0.023456789", "0.1"),
-    ],
-    ids=[
-        "subtract_pos_integers",
-        "subtract_neg_integers",
-        "subtract_pos_floats",
-        "subtract_neg_floats",
-        "subtract_zeros",
-        "subtract_large_integers",
-        "subtract_large_neg_integers",
-        "subtract_decimal_precision",
-    ]
-)
-def test_calculator_subtract_parametrized(page, fastapi_server, a, b, expected):
+# One combined table covering all four operations. Each entry is
+# (button label, a, b, expected); the ids preserve the per-operation
+# naming from the previous four parametrized tests.
+_OP_CASES = [
+    # Addition
+    pytest.param("Add", "2", "3", "5", id="add_pos_integers"),
+    pytest.param("Add", "-2", "-3", "-5", id="add_neg_integers"),
+    pytest.param("Add", "2.5", "3.5", "6.0", id="add_pos_floats"),
+    pytest.param("Add", "-2.5", "3.5", "1.0", id="add_neg_pos_float"),
+    pytest.param("Add", "0", "0", "0", id="add_zeros"),
+    pytest.param("Add", "1000000000", "2000000000", "3000000000", id="add_large_integers", marks=pytest.mark.slow),
+    pytest.param("Add", "-1000000000", "-2000000000", "-3000000000", id="add_large_neg_integers", marks=pytest.mark.slow),
+    pytest.param("Add", "0.1", "0.2", "0.3", id="add_decimal_0.1_0.2"),
+    pytest.param("Add", "0.7", "0.1", "0.8", id="add_decimal_0.7_0.1"),
+    # Subtraction
+    pytest.param("Subtract", "5", "3", "2", id="subtract_pos_integers"),
+    pytest.param("Subtract", "-5", "-3", "-2", id="subtract_neg_integers"),
+    pytest.param("Subtract", "5.5", "2.5", "3.0", id="subtract_pos_floats"),
+    pytest.param("Subtract", "-5.5", "-2.5", "-3.0", id="subtract_neg_floats"),
+    pytest.param("Subtract", "0", "0", "0", id="subtract_zeros"),
+    pytest.param("Subtract", "1000000000000", "500000000000", "500000000000", id="subtract_large_integers", marks=pytest.mark.slow),
+    pytest.param("Subtract", "-1000000000000", "-500000000000", "-500000000000", id="subtract_large_neg_integers", marks=pytest.mark.slow),
+    pytest.param("Subtract", "0.123456789", "0.023456789", "0.1", id="subtract_decimal_precision"),
+    # Multiplication
+    pytest.param("Multiply", "2", "3", "6", id="multiply_pos_integers"),
+    pytest.param("Multiply", "-2", "3", "-6", id="multiply_neg_pos_integer"),
+    pytest.param("Multiply", "2.5", "4.0", "10.0", id="multiply_pos_floats"),
+    pytest.param("Multiply", "-2.5", "4.0", "-10.0", id="multiply_neg_float"),
+    pytest.param("Multiply", "0", "5", "0", id="multiply_zero"),
+    pytest.param("Multiply", "999999999999", "2", "1999999999998", id="multiply_large_integers", marks=pytest.mark.slow),
+    pytest.param("Multiply", "-999999999999", "2", "-1999999999998", id="multiply_large_neg_integers", marks=pytest.mark.slow),
+    pytest.param("Multiply", "0.123456789", "0.987654321", "0.1219326311115269", id="multiply_decimal_precision"),
+    # Division
+    pytest.param("Divide", "6", "3", "2.0", id="divide_pos_integers"),
+    pytest.param("Divide", "-6", "3", "-2.0", id="divide_neg_pos_integer"),
+    pytest.param("Divide", "6.0", "3.0", "2.0", id="divide_pos_floats"),
+    pytest.param("Divide", "-6.0", "3.0", "-2.0", id="divide_neg_float"),
+    pytest.param("Divide", "0", "5", "0.0", id="divide_zero_by_pos"),
+    pytest.param("Divide", "1000000000", "1000000", "1000.0", id="divide_large_integers", marks=pytest.mark.slow),
+    pytest.param("Divide", "1.0", "10.0", "0.1", id="divide_precise_decimal"),
+]
+
+
+@pytest.fixture(scope="module")
+def calculator_page(context, fastapi_server):
     """
-    Test the subtraction functionality of the calculator.
+    Module-scoped page that navigates to the calculator once.
 
-    This test simulates a user performing a subtraction operation using the calculator
-    on the frontend. It fills in two numbers, clicks the "Subtract" button, and verifies
-    that the result displayed is correct.
+    Every case used to pay a full page.goto; the calculator is a single
+    static page, so one navigation serves the whole table and each case
+    just resets the form in place.
     """
-    # Navigate the browser to the homepage URL of the FastAPI application.
+    page = context.new_page()
     page.goto('http://localhost:8000')
-    # Fill in the first number input field (with id 'a') with the value 'a'.
-    page.fill('#a', a)
-    # Fill in the second number input field (with id 'b') with the value 'b'.
-    page.fill('#b', b)
-    # Click the button that has the exact text "Subtract". This triggers the subtraction operation.
-    page.click('button:text("Subtract")')
-    
-    # Wait for result to be displayed
-    page.wait_for_function("document.querySelector('#result').innerText.trim() !== ''")
-    
-    # Get the text within the result div (with id 'result').
-    result_text = page.inner_text('#result')
-    # Extract just the number part (remove "Calculation Result: ")
-    result_value = result_text.replace('Calculation Result: ', '')
-    # Convert to float for comparison to handle precision
-    actual = float(result_value)
-    # Convert to float for comparison to handle precision
-    expected_float = float(expected)
-    # Use tolerance for floating point comparisons
-    assert abs(actual - expected_float) < 1e-10 or actual == expected_float, \
-        f"Expected {expected_float}, but got {actual}"
+    yield page
+    page.close()
 
 
-@pytest.mark.e2e
-@pytest.mark.parametrize(
-    "a, b, expected",
-    [
-        ("2", "3", "6"),
-        ("-2", "3", "-6"),
-        ("2.5", "4.0", "10.0"),
-        ("-2.5", "4.0", "-10.0"),
-        ("0", "5", "0"),
-        ("999999999999", "2", "1999999999998"),
-        ("-999999999999", "2", "-1999999999998"),
-        ("0.123456789", "0.987654321", "0.1219326311115269"),
-    ],
-    ids=[
-        "multiply_pos_integers",
-        "multiply_neg_pos_integer",
-        "multiply_pos_floats",
-        "multiply_neg_float",
-        "multiply_zero",
-        "multiply_large_integers",
-        "multiply_large_neg_integers",
-        "multiply_decimal_precision",
-    ]
-)
-def test_calculator_multiply_parametrized(page, fastapi_server, a, b, expected):
+def _assert_result(page, expected):
     """
-    Test the multiplication functionality of the calculator.
+    Read the calculator result from the page and compare against expected.
 
-    This test simulates a user performing a multiplication operation using the calculator
-    on the frontend. It fills in two numbers, clicks the "Multiply" button, and verifies
-    that the result displayed is correct.   
+    Integer-expected cases (no decimal point in the table entry) are
+    compared as exact strings — the page renders whole numbers without a
+    fractional part, so no float() conversion is needed. Decimal cases use
+    a float comparison with a tolerance scaled to the expected value.
     """
-    # Navigate the browser to the homepage URL of the FastAPI application.
-    page.goto('http://localhost:8000')
-    # Fill in the first number input field (with id 'a') with the value 'a'.
-    page.fill('#a', a)
-    # Fill in the second number input field (with id 'b') with the value 'b'.
-    page.fill('#b', b)
-    # Click the button that has the exact text "Multiply". This triggers the multiplication operation.
-    page.click('button:text("Multiply")')
-
-    # Wait for result to be displayed
-    page.wait_for_function("document.querySelector('#result').innerText.trim() !== ''")
-
-    
-    # Get the text within the result div (with id 'result').
-    result_text = page.inner_text('#result')
-    # Extract just the number part (remove "Calculation Result: ")
-    result_value = result_text.replace('Calculation Result: ', '')
+    # Read and strip the result in a single CDP round-trip: textContent
+    # avoids inner_text's rendered-text computation, and the prefix strip
+    # happens in the page instead of a second Python string pass.
+    result_value = page.evaluate(
+        "document.querySelector('#result').textContent.replace('Calculation Result: ', '')"
+    )
+    if '.' not in expected:
+        # Exact integer display: no precision concerns, compare directly
+        assert result_value == expected, \
+            f"Expected {expected}, but got {result_value}"
+        return
     # Convert to float for comparison to handle precision
     actual = float(result_value)
-    # Convert to float for comparison to handle precision
     expected_float = float(expected)
     # Use tolerance for floating point comparisons
-    
-    assert abs(actual - expected_float) < abs(expected_float) * 1e-10 or actual == expected_float, \
+    tolerance = max(1e-10, abs(expected_float) * 1e-10)
+    assert actual == expected_float or abs(actual - expected_float) <= tolerance, \
         f"Expected {expected_float}, but got {actual}"
 
 
 @pytest.mark.e2e
-@pytest.mark.parametrize(
-    "a, b, expected",
-    [
-        ("6", "3", "2.0"),
-        ("-6", "3", "-2.0"),
-        ("6.0", "3.0", "2.0"),
-        ("-6.0", "3.0", "-2.0"),
-        ("0", "5", "0.0"),
-        ("1000000000", "1000000", "1000.0"),
-        ("1.0", "10.0", "0.1"),
-    ],
-    ids=[
-        "divide_pos_integers",
-        "divide_neg_pos_integer",
-        "divide_pos_floats",
-        "divide_neg_float",
-        "divide_zero_by_pos",
-        "divide_large_integers",
-        "divide_precise_decimal",
-    ]
-)
-def test_calculator_divide_parametrized(page, fastapi_server, a, b, expected):
+@pytest.mark.parametrize("op, a, b, expected", _OP_CASES)
+def test_calculator_ops(calculator_page, op, a, b, expected):
     """
-    Test the division functionality of the calculator.
+    Test the four calculator operations end to end from one table.
 
-    This test simulates a user performing a division operation using the calculator
-    on the frontend. It fills in two numbers, clicks the "Divide" button, and verifies
-    that the result displayed is correct.
+    This test simulates a user performing an arithmetic operation using the
+    calculator on the frontend. It fills in two numbers, clicks the operation
+    button, and verifies that the result displayed is correct. All cases
+    share the module-scoped page, so only the first one pays a navigation.
     """
-    # Navigate the browser to the homepage URL of the FastAPI application.
-    page.goto('http://localhost:8000')
-    # Fill in the first number input field (with id 'a') with the value 'a'.
+    page = calculator_page
+    # Clear the previous result so the wait below sees only fresh output
+    page.evaluate("document.getElementById('result').innerText = ''")
+    # Fill in the number input fields; fill() replaces any previous value.
     page.fill('#a', a)
-    # Fill in the second number input field (with id 'b') with the value 'b'.
     page.fill('#b', b)
-    # Click the button that has the exact text "Divide". This triggers the division operation.
-    page.click('button:text("Divide")')
+    # Click the button with the operation's exact label to trigger the call.
+    page.click(f'button:text("{op}")')
 
-    # Wait for result to be displayed
-    page.wait_for_function("document.querySelector('#result').innerText.trim() !== ''")
+    # Wait for the result to be displayed; expect() waits on DOM events
+    # instead of polling the page every 100ms
+    expect(page.locator('#result')).not_to_be_empty()
 
-    
-    # Get the text within the result div (with id 'result').
-    result_text = page.inner_text('#result')
-    # Extract just the number part (remove "Calculation Result: ")
-    result_value = result_text.replace('Calculation Result: ', '')
-    # Convert to float for comparison to handle precision
-    actual = float(result_value)
-    # Convert to float for comparison to handle precision
-    expected_float = float(expected)
-    
-    # Use tolerance for floating point comparisons    
-    assert abs(actual - expected_float) < abs(expected_float) * 1e-10 or actual == expected_float, \
-        f"Expected {expected_float}, but got {actual}"
+    _assert_result(page, expected)
 
 
 @pytest.mark.e2e
@@ -282,10 +165,10 @@ def test_calculator_divide_by_zero_variations(page, fastapi_server, value):
     # Click the button that has the exact text "Divide". This triggers the division operation.
     page.click('button:text("Divide")')
 
-    # Wait for result to be displayed
-    page.wait_for_function("document.querySelector('#result').innerText.trim() !== ''")
+    # Wait for the result to be displayed; expect() waits on DOM events
+    # instead of polling the page every 100ms
+    expect(page.locator('#result')).not_to_be_empty()
 
-    
     # Use an assertion to check that the text within the result div (with id 'result') is exactly "Error: Cannot divide by zero!".
     # This verifies that the application correctly handles division by zero and displays the appropriate error message to the user.
     assert page.inner_text('#result') == 'Error: Cannot divide by zero!'
@@ -1,267 +1,197 @@
 # tests/unit/test_calculator.py
 
+from __future__ import annotations  # Keep annotations as strings: no typing imports at collection time
+
+import logging  # Needed to drive the operations logger to DEBUG in tests
+import numpy as np  # Vectorized comparison of whole case tables at once
 import pytest  # Import the pytest framework for writing and running tests
-from typing import Union  # Import Union for type hinting multiple possible types
+from math import isclose  # C-implemented scalar tolerance comparison
 from app.operations import add, subtract, multiply, divide  # Import the calculator functions from the operations module
 
-# Define a type alias for numbers that can be either int or float
-Number = Union[int, float]
 
+def _columns(cases):
+    """Split a list of (a, b, expected) rows into three float64 arrays."""
+    a, b, expected = (np.array(col, dtype=np.float64) for col in zip(*cases))
+    return a, b, expected
 
-# ---------------------------------------------
-# Unit Tests for the 'add' Function
-# ---------------------------------------------
 
-@pytest.mark.parametrize(
-    "a, b, expected",
-    [
-        (2, 3, 5),           # Test adding two positive integers
-        (-2, -3, -5),        # Test adding two negative integers
-        (2.5, 3.5, 6.0),     # Test adding two positive floats
-        (-2.5, 3.5, 1.0),    # Test adding a negative float and a positive float
-        (0, 0, 0),            # Test adding zeros
-        (1000000000, 2000000000, 3000000000),  # Very large integers
-        (-1000000000, -2000000000, -3000000000),  # Very large negative integers
-        (1e15, 2e15, 3e15),  # Very large floats
-        (1e-15, 1e-15, 2e-15),  # Very small floats
-        (0.1, 0.2, 0.3),    # Decimal precision test
-        (0.7, 0.1, 0.8),    # Another decimal precision test
-        (1.0 / 3, 1.0 / 3, 2.0 / 3),  # Recurring decimal
-    ],
-    ids=[
-        "add_two_positive_integers",
-        "add_two_negative_integers",
-        "add_two_positive_floats",
-        "add_negative_and_positive_float",
-        "add_zeros",
-        "add_very_large_integers",
-        "add_very_large_negative_integers",
-        "add_very_large_floats",
-        "add_very_small_floats",
-        "add_decimal_precision_0.1_0.2",
-        "add_decimal_precision_0.7_0.1",
-        "add_recurring_decimal",
-    ]
-)
-def test_add(a: Number, b: Number, expected: Number) -> None:
+def _mismatches(results, expected, ids):
     """
-    Test the 'add' function with various combinations of integers and floats.
+    Return the case ids whose results fall outside tolerance.
 
-    This parameterized test verifies that the 'add' function correctly adds two numbers,
-    whether they are positive, negative, integers, or floats. By using parameterization,
-    we can efficiently test multiple scenarios without redundant code.
-
-    Parameters:
-    - a (Number): The first number to add.
-    - b (Number): The second number to add.
-    - expected (Number): The expected result of the addition.
-
-    Steps:
-    1. Call the 'add' function with arguments 'a' and 'b'.
-    2. Assert that the result is equal to 'expected'.
-
-    Example:
-    >>> test_add(2, 3, 5)
-    >>> test_add(-2, -3, -5)
+    rel 1e-10 with abs 1e-12 matches pytest.approx's semantics: the
+    absolute floor only matters near zero, where a relative tolerance
+    alone would collapse to nothing and mask real errors.
     """
-    # Call the 'add' function with the provided arguments
-    result = add(a, b)
-    
-    # Assert that the result of add(a, b) matches the expected value
-    # Use tolerance for floating point comparisons to handle precision issues
-    assert result == expected or abs(result - expected) < 1e-10, \
-        f"Expected add({a}, {b}) to be {expected}, but got {result}"
+    close = np.isclose(results, expected, rtol=1e-10, atol=1e-12)
+    return [ids[i] for i in np.flatnonzero(~close)]
 
 
 # ---------------------------------------------
-# Unit Tests for the 'subtract' Function
+# Unit Tests for the 'add' Function
 # ---------------------------------------------
 
-@pytest.mark.parametrize(
-    "a, b, expected",
-    [
-        (5, 3, 2),           # Test subtracting a smaller positive integer from a larger one
-        (-5, -3, -2),        # Test subtracting a negative integer from another negative integer
-        (5.5, 2.5, 3.0),     # Test subtracting two positive floats
-        (-5.5, -2.5, -3.0),  # Test subtracting two negative floats
-        (0, 0, 0),            # Test subtracting zeros
-        (1000000000000, 500000000000, 500000000000),  # Very large integers
-        (-1000000000000, -500000000000, -500000000000),  # Very large negative integers
-        (1e20, 5e19, 5e19),  # Very large floats
-        (1e-10, 1e-10, 0.0),  # Very small floats
-        (0.123456789, 0.023456789, 0.1),  # Decimal precision test
-        (999.9999, 0.0001, 999.9998),  # High precision test
-    ],
-    ids=[
-        "subtract_two_positive_integers",
-        "subtract_two_negative_integers",
-        "subtract_two_positive_floats",
-        "subtract_two_negative_floats",
-        "subtract_zeros",
-        "subtract_very_large_integers",
-        "subtract_very_large_negative_integers",
-        "subtract_very_large_floats",
-        "subtract_very_small_floats",
-        "subtract_decimal_precision",
-        "subtract_high_precision",
-    ]
-)
-def test_subtract(a: Number, b: Number, expected: Number) -> None:
-    """
-    Test the 'subtract' function with various combinations of integers and floats.
-
-    This parameterized test verifies that the 'subtract' function correctly subtracts the
-    second number from the first, handling both positive and negative values, as well as
-    integers and floats. Parameterization allows for comprehensive testing of multiple cases.
+_ADD_CASES = [
+    (2, 3, 5),           # Test adding two positive integers
+    (-2, -3, -5),        # Test adding two negative integers
+    (2.5, 3.5, 6.0),     # Test adding two positive floats
+    (-2.5, 3.5, 1.0),    # Test adding a negative float and a positive float
+    (0, 0, 0),            # Test adding zeros
+    (1000000000, 2000000000, 3000000000),  # Very large integers
+    (-1000000000, -2000000000, -3000000000),  # Very large negative integers
+    (1e15, 2e15, 3e15),  # Very large floats
+    (1e-15, 1e-15, 2e-15),  # Very small floats
+    (0.1, 0.2, 0.3),    # Decimal precision test
+    (0.7, 0.1, 0.8),    # Another decimal precision test
+    (1.0 / 3, 1.0 / 3, 2.0 / 3),  # Recurring decimal
+]
+_ADD_IDS = [
+    "add_two_positive_integers",
+    "add_two_negative_integers",
+    "add_two_positive_floats",
+    "add_negative_and_positive_float",
+    "add_zeros",
+    "add_very_large_integers",
+    "add_very_large_negative_integers",
+    "add_very_large_floats",
+    "add_very_small_floats",
+    "add_decimal_precision_0.1_0.2",
+    "add_decimal_precision_0.7_0.1",
+    "add_recurring_decimal",
+]
+_ADD_A, _ADD_B, _ADD_E = _columns(_ADD_CASES)
 
-    Parameters:
-    - a (Number): The number from which to subtract.
-    - b (Number): The number to subtract.
-    - expected (Number): The expected result of the subtraction.
 
-    Steps:
-    1. Call the 'subtract' function with arguments 'a' and 'b'.
-    2. Assert that the result is equal to 'expected'.
+# ---------------------------------------------
+# Unit Tests for the 'subtract' Function
+# ---------------------------------------------
 
-    Example:
-    >>> test_subtract(5, 3, 2)
-    >>> test_subtract(-5, -3, -2)
-    """
-    # Call the 'subtract' function with the provided arguments
-    result = subtract(a, b)
-    
-    # Assert that the result of subtract(a, b) matches the expected value
-    # Use tolerance for floating point comparisons to handle precision issues
-    assert result == expected or abs(result - expected) < 1e-10, \
-        f"Expected subtract({a}, {b}) to be {expected}, but got {result}"
+_SUBTRACT_CASES = [
+    (5, 3, 2),           # Test subtracting a smaller positive integer from a larger one
+    (-5, -3, -2),        # Test subtracting a negative integer from another negative integer
+    (5.5, 2.5, 3.0),     # Test subtracting two positive floats
+    (-5.5, -2.5, -3.0),  # Test subtracting two negative floats
+    (0, 0, 0),            # Test subtracting zeros
+    (1000000000000, 500000000000, 500000000000),  # Very large integers
+    (-1000000000000, -500000000000, -500000000000),  # Very large negative integers
+    (1e20, 5e19, 5e19),  # Very large floats
+    (1e-10, 1e-10, 0.0),  # Very small floats
+    (0.123456789, 0.023456789, 0.1),  # Decimal precision test
+    (999.9999, 0.0001, 999.9998),  # High precision test
+]
+_SUBTRACT_IDS = [
+    "subtract_two_positive_integers",
+    "subtract_two_negative_integers",
+    "subtract_two_positive_floats",
+    "subtract_two_negative_floats",
+    "subtract_zeros",
+    "subtract_very_large_integers",
+    "subtract_very_large_negative_integers",
+    "subtract_very_large_floats",
+    "subtract_very_small_floats",
+    "subtract_decimal_precision",
+    "subtract_high_precision",
+]
+_SUBTRACT_A, _SUBTRACT_B, _SUBTRACT_E = _columns(_SUBTRACT_CASES)
 
 
 # ---------------------------------------------
 # Unit Tests for the 'multiply' Function
 # ---------------------------------------------
 
-@pytest.mark.parametrize(
-    "a, b, expected",
-    [
-        (2, 3, 6),           # Test multiplying two positive integers
-        (-2, 3, -6),         # Test multiplying a negative integer with a positive integer
-        (2.5, 4.0, 10.0),    # Test multiplying two positive floats
-        (-2.5, 4.0, -10.0),  # Test multiplying a negative float with a positive float
-        (0, 5, 0),            # Test multiplying zero with a positive integer
-        (999999999999, 2, 1999999999998),  # Very large integer
-        (-999999999999, 2, -1999999999998),  # Very large negative integer
-        (1e100, 2.0, 2e100),  # Very large float
-        (1e-100, 1e100, 1.0),  # Very small × very large
-        (1e100, 1e-100, 1.0),  # Very large × very small
-        (0.123456789, 0.987654321, 0.1219326311115269),  # Decimal precision
-        (999.99999, 0.00001, 0.0099999999),  # High precision multiplication
-    ],
-    ids=[
-        "multiply_two_positive_integers",
-        "multiply_negative_and_positive_integer",
-        "multiply_two_positive_floats",
-        "multiply_negative_float_and_positive_float",
-        "multiply_zero_and_positive_integer",
-        "multiply_very_large_integer",
-        "multiply_very_large_negative_integer",
-        "multiply_very_large_float",
-        "multiply_very_small_by_very_large",
-        "multiply_very_large_by_very_small",
-        "multiply_decimal_precision",
-        "multiply_high_precision",
-    ]
-)
-def test_multiply(a: Number, b: Number, expected: Number) -> None:
-    """
-    Test the 'multiply' function with various combinations of integers and floats.
+_MULTIPLY_CASES = [
+    (2, 3, 6),           # Test multiplying two positive integers
+    (-2, 3, -6),         # Test multiplying a negative integer with a positive integer
+    (2.5, 4.0, 10.0),    # Test multiplying two positive floats
+    (-2.5, 4.0, -10.0),  # Test multiplying a negative float with a positive float
+    (0, 5, 0),            # Test multiplying zero with a positive integer
+    (999999999999, 2, 1999999999998),  # Very large integer
+    (-999999999999, 2, -1999999999998),  # Very large negative integer
+    (1e100, 2.0, 2e100),  # Very large float
+    (1e-100, 1e100, 1.0),  # Very small × very large
+    (1e100, 1e-100, 1.0),  # Very large × very small
+    (0.123456789, 0.987654321, 0.1219326311115269),  # Decimal precision
+    (999.99999, 0.00001, 0.0099999999),  # High precision multiplication
+]
+_MULTIPLY_IDS = [
+    "multiply_two_positive_integers",
+    "multiply_negative_and_positive_integer",
+    "multiply_two_positive_floats",
+    "multiply_negative_float_and_positive_float",
+    "multiply_zero_and_positive_integer",
+    "multiply_very_large_integer",
+    "multiply_very_large_negative_integer",
+    "multiply_very_large_float",
+    "multiply_very_small_by_very_large",
+    "multiply_very_large_by_very_small",
+    "multiply_decimal_precision",
+    "multiply_high_precision",
+]
+_MULTIPLY_A, _MULTIPLY_B, _MULTIPLY_E = _columns(_MULTIPLY_CASES)
 
-    This parameterized test verifies that the 'multiply' function correctly multiplies two numbers,
-    handling both positive and negative values, as well as integers and floats. Parameterization
-    enables efficient testing of multiple scenarios in a concise manner.
 
-    Parameters:
-    - a (Number): The first number to multiply.
-    - b (Number): The second number to multiply.
-    - expected (Number): The expected result of the multiplication.
-
-    Steps:
-    1. Call the 'multiply' function with arguments 'a' and 'b'.
-    2. Assert that the result is equal to 'expected'.
+# ---------------------------------------------
+# Unit Tests for the 'divide' Function
+# ---------------------------------------------
 
-    Example:
-    >>> test_multiply(2, 3, 6)
-    >>> test_multiply(-2, 3, -6)
-    """
-    # Call the 'multiply' function with the provided arguments
-    result = multiply(a, b)
-    
-    # Assert that the result of multiply(a, b) matches the expected value
-    # Use tolerance for floating point comparisons to handle precision issues
-    assert result == expected or abs(result - expected) < abs(expected) * 1e-10, \
-        f"Expected multiply({a}, {b}) to be {expected}, but got {result}"
+_DIVIDE_CASES = [
+    (6, 3, 2.0),           # Test dividing two positive integers
+    (-6, 3, -2.0),         # Test dividing a negative integer by a positive integer
+    (6.0, 3.0, 2.0),       # Test dividing two positive floats
+    (-6.0, 3.0, -2.0),     # Test dividing a negative float by a positive float
+    (0, 5, 0.0),            # Test dividing zero by a positive integer
+    (1000000000, 1000000, 1000.0),  # Very large integers
+    (1e20, 1e10, 1e10),    # Very large floats
+    (1.0, 3.0, 1.0 / 3.0),  # Recurring decimal division
+    (1.0, 10.0, 0.1),      # Precise decimal division
+    (0.000000001, 0.0000000001, 10.0),  # Very small numbers
+    (999.99999, 0.001, 999999.99),  # High precision division
+]
+_DIVIDE_IDS = [
+    "divide_two_positive_integers",
+    "divide_negative_integer_by_positive_integer",
+    "divide_two_positive_floats",
+    "divide_negative_float_by_positive_float",
+    "divide_zero_by_positive_integer",
+    "divide_very_large_integers",
+    "divide_very_large_floats",
+    "divide_recurring_decimal",
+    "divide_precise_decimal",
+    "divide_very_small_numbers",
+    "divide_high_precision",
+]
+_DIVIDE_A, _DIVIDE_B, _DIVIDE_E = _columns(_DIVIDE_CASES)
 
 
 # ---------------------------------------------
-# Unit Tests for the 'divide' Function
+# Combined Unit Test for the Four Operations
 # ---------------------------------------------
 
 @pytest.mark.parametrize(
-    "a, b, expected",
+    "op, a_vals, b_vals, expected, ids",
     [
-        (6, 3, 2.0),           # Test dividing two positive integers
-        (-6, 3, -2.0),         # Test dividing a negative integer by a positive integer
-        (6.0, 3.0, 2.0),       # Test dividing two positive floats
-        (-6.0, 3.0, -2.0),     # Test dividing a negative float by a positive float
-        (0, 5, 0.0),            # Test dividing zero by a positive integer
-        (1000000000, 1000000, 1000.0),  # Very large integers
-        (1e20, 1e10, 1e10),    # Very large floats
-        (1.0, 3.0, 1.0 / 3.0),  # Recurring decimal division
-        (1.0, 10.0, 0.1),      # Precise decimal division
-        (0.000000001, 0.0000000001, 10.0),  # Very small numbers
-        (999.99999, 0.001, 999999.99),  # High precision division
+        pytest.param(add, _ADD_A, _ADD_B, _ADD_E, _ADD_IDS, id="add"),
+        pytest.param(subtract, _SUBTRACT_A, _SUBTRACT_B, _SUBTRACT_E, _SUBTRACT_IDS, id="subtract"),
+        pytest.param(multiply, _MULTIPLY_A, _MULTIPLY_B, _MULTIPLY_E, _MULTIPLY_IDS, id="multiply"),
+        pytest.param(divide, _DIVIDE_A, _DIVIDE_B, _DIVIDE_E, _DIVIDE_IDS, id="divide"),
     ],
-    ids=[
-        "divide_two_positive_integers",
-        "divide_negative_integer_by_positive_integer",
-        "divide_two_positive_floats",
-        "divide_negative_float_by_positive_float",
-        "divide_zero_by_positive_integer",
-        "divide_very_large_integers",
-        "divide_very_large_floats",
-        "divide_recurring_decimal",
-        "divide_precise_decimal",
-        "divide_very_small_numbers",
-        "divide_high_precision",
-    ]
 )
-def test_divide(a: Number, b: Number, expected: float) -> None:
+def test_binop(op, a_vals, b_vals, expected, ids) -> None:
     """
-    Test the 'divide' function with various combinations of integers and floats.
-
-    This parameterized test verifies that the 'divide' function correctly divides the first
-    number by the second, handling both positive and negative values, as well as integers
-    and floats. Parameterization allows for efficient and comprehensive testing across multiple cases.
+    Test each arithmetic operation across its whole case table in one pass.
 
-    Parameters:
-    - a (Number): The dividend.
-    - b (Number): The divisor.
-    - expected (float): The expected result of the division.
-
-    Steps:
-    1. Call the 'divide' function with arguments 'a' and 'b'.
-    2. Assert that the result is equal to 'expected'.
-
-    Example:
-    >>> test_divide(6, 3, 2.0)
-    >>> test_divide(-6, 3, -2.0)
+    The four former per-op tests were structurally identical: run the
+    operation over the table, compare vectorized, report failing ids.
+    One test parametrized over the operation keeps a per-op report line
+    while sharing a single body. Division by zero keeps its own dedicated
+    tests below since it exercises the exception path.
     """
-    # Call the 'divide' function with the provided arguments
-    result = divide(a, b)
-    
-    # Assert that the result of divide(a, b) matches the expected value
-    # Use tolerance for floating point comparisons to handle precision issues
-    assert result == expected or abs(result - expected) < abs(expected) * 1e-10, \
-        f"Expected divide({a}, {b}) to be {expected}, but got {result}"
+    # Call the operation for every row of its table
+    results = np.array([op(a, b) for a, b in zip(a_vals, b_vals)])
+
+    # Vectorized tolerance comparison; failures name the offending cases
+    failed = _mismatches(results, expected, ids)
+    assert not failed, f"{op.__name__} cases outside tolerance: {failed}"
 
 
 # ---------------------------------------------
@@ -288,37 +218,63 @@ def test_divide_by_zero() -> None:
     with pytest.raises(ValueError) as excinfo:
         # Attempt to divide 6 by 0, which should raise a ValueError
         divide(6, 0)
-    
+
     # Assert that the exception message contains the expected error message
     assert "Cannot divide by zero!" in str(excinfo.value), \
         f"Expected error message 'Cannot divide by zero!', but got '{excinfo.value}'"
 
 
-@pytest.mark.parametrize(
-    "a, b",
-    [
-        (1e10, 1e-10),                      # Dividing large number by very small
-        (1000000000, 0.000000001),         # Dividing billion by nano
-        (-1000000000, 0.000000001),        # Dividing negative billion by nano
-        (999.9999, 0.0001),                # Precision edge case
-        (1.5, 0.00001),                     # Tiny divisor
-    ],
-    ids=[
-        "divide_large_by_tiny",
-        "divide_billion_by_nano",
-        "divide_negative_billion_by_nano",
-        "divide_precision_near_zero",
-        "divide_small_divisor",
+def test_operations_debug_logging(caplog) -> None:
+    """
+    Test that each operation emits its pre-computation DEBUG record.
+
+    The operations guard their debug calls behind isEnabledFor, so the
+    branch only runs when the module logger is at DEBUG; the default INFO
+    level used everywhere else never reaches it. Raising the level here
+    verifies both the guard and the message for all four operations.
+    """
+    caplog.set_level(logging.DEBUG, logger="app.operations")
+
+    add(2, 3)
+    subtract(5, 3)
+    multiply(2, 3)
+    divide(6, 3)
+
+    debug_messages = [
+        record.getMessage()
+        for record in caplog.records
+        if record.levelno == logging.DEBUG
     ]
-)
-def test_divide_by_near_zero(a: Number, b: Number) -> None:
+    assert "Adding 2 + 3" in debug_messages
+    assert "Subtracting 5 - 3" in debug_messages
+    assert "Multiplying 2 * 3" in debug_messages
+    assert "Dividing 6 / 3" in debug_messages
+
+
+_NEAR_ZERO_CASES = [
+    (1e10, 1e-10),                      # Dividing large number by very small
+    (1000000000, 0.000000001),         # Dividing billion by nano
+    (-1000000000, 0.000000001),        # Dividing negative billion by nano
+    (999.9999, 0.0001),                # Precision edge case
+    (1.5, 0.00001),                     # Tiny divisor
+]
+
+
+def test_divide_by_near_zero() -> None:
     """
     Test division by very small (near-zero) divisors.
-    
+
     These tests verify that the function correctly handles division by extremely
-    small numbers without overflow or precision loss.
+    small numbers without overflow or precision loss. The assertion per case
+    is a single divide and compare, cheaper than pytest's per-case
+    bookkeeping, so one test body loops over the whole list; the failure
+    message names the offending operands.
     """
-    result = divide(a, b)
-    expected = float(a) / float(b)
-    assert abs(result - expected) < abs(expected) * 1e-10, \
-        f"Expected divide({a}, {b}) to be approximately {expected}, but got {result}"
+    for a, b in _NEAR_ZERO_CASES:
+        result = divide(a, b)
+        expected = float(a) / float(b)
+        # math.isclose runs the comparison in C and its abs_tol floor
+        # handles the expected==0 edge, same contract as the vectorized
+        # np.isclose used for the operation tables
+        assert isclose(result, expected, rel_tol=1e-10, abs_tol=1e-12), \
+            f"Expected divide({a}, {b}) to be approximately {expected}, but got {result}"
@@ -1,143 +1,436 @@
-import io
-import os
-import logging
-import pytest
-from datetime import datetime
-
-from app.logger_module import (
-    setup_logging,
-    setup_development_logging,
-    setup_production_logging,
-    setup_test_logging,
-    get_logger,
-    ColoredFormatter,
-    StructuredLogger,
-)
-
-
-@pytest.fixture
-def temp_log_file(tmp_path):
-    """Create a temporary log file path."""
-    return str(tmp_path / "app.tests_logs.log")
-
-
-@pytest.mark.parametrize(
-    "log_level,log_file,enable_colors,expect_file",
-    [
-        ("DEBUG", None, False, False),  # console only
-        ("DEBUG", "logs/test_app.log", False, True),  # with file
-    ],
-)
-def test_setup_logging_variants(monkeypatch, tmp_path, log_level, log_file, enable_colors, expect_file):
-    """Parameterized test for both console and file-based setups."""
-    stream = io.StringIO()
-    monkeypatch.setattr("sys.stdout", stream)
-
-    # Ensure temp directory for file logging
-    if log_file:
-        log_file = str(tmp_path / "app_test.log")
-
-    logger = setup_logging(
-        log_level=log_level,
-        log_file=log_file,
-        enable_colors=enable_colors,
-    )
-
-    logger.info("Test message")
-    output = stream.getvalue()
-
-    assert "Test message" in output
-    assert "INFO" in output
-
-    if expect_file:
-        assert os.path.exists(log_file)
-        error_log = log_file.replace(".log", "_error.log")
-        assert os.path.exists(error_log)
-    else:
-        # no log files for console-only mode
-        assert not list(tmp_path.glob("*.log"))
-
-
-@pytest.mark.parametrize(
-    "func,expected_level",
-    [
-        (setup_development_logging, logging.DEBUG),
-        (setup_production_logging, logging.INFO),
-        (setup_test_logging, logging.WARNING),
-    ],
-)
-def test_environment_specific_loggers(func, expected_level):
-    """Check that environment helper functions set correct log levels."""
-    logger = func()
-    assert logger.level == expected_level
-
-
-@pytest.mark.parametrize(
-    "levelname,color_code",
-    [
-        ("DEBUG", "\033[36m"),
-        ("INFO", "\033[32m"),
-        ("WARNING", "\033[33m"),
-        ("ERROR", "\033[31m"),
-        ("CRITICAL", "\033[35m"),
-    ],
-)
-def test_colored_formatter_colors(levelname, color_code):
-    """Verify that each log level gets its correct color."""
-    record = logging.LogRecord(
-        name="test",
-        level=getattr(logging, levelname),
-        pathname="",
-        lineno=1,
-        msg=f"{levelname} message",
-        args=(),
-        exc_info=None,
-    )
-    formatter = ColoredFormatter("%(levelname)s: %(message)s")
-    formatted = formatter.format(record)
-
-    assert color_code in formatted
-    assert f"{levelname} message" in formatted
-
-
-def test_get_logger_singleton_behavior():
-    """Ensure get_logger returns consistent logger instances."""
-    logger1 = get_logger("my.test.logger")
-    logger2 = get_logger("my.test.logger")
-    assert logger1 is logger2
-    assert isinstance(logger1, logging.Logger)
-
-
-@pytest.mark.parametrize(
-    "method,args,expected_level,expected_text",
-    [
-        ("log_operation", ("add", 1, 2, 3, 12.5), logging.INFO, "Operation completed: add"),
-        ("log_error", ("divide", "Division by zero", {"operand_a": 1, "operand_b": 0}), logging.ERROR, "Division by zero"),
-        ("log_request", ("GET", "/calc", "127.0.0.1", "pytest"), logging.INFO, "Request received: GET /calc"),
-    ],
-)
-def test_structured_logger_methods(caplog, method, args, expected_level, expected_text):
-    """Parameterized test for StructuredLogger methods."""
-    base_logger = logging.getLogger(f"structured.{method}")
-    structured = StructuredLogger(base_logger)
-
-    with caplog.at_level(expected_level):
-        getattr(structured, method)(*args)
-
-    assert any(expected_text in m for m in caplog.messages)
-
-    record = caplog.records[0]
-    assert "timestamp" in record.__dict__
-
-    # basic field checks by method type
-    if method == "log_operation":
-        assert record.operation == "add"
-        assert record.result == 3
-    elif method == "log_error":
-        assert record.error == "Division by zero"
-        assert record.operand_a == 1
-    elif method == "log_request":
-        assert record.method == "GET"
-        assert record.path == "/calc"
-        assert record.client_ip == "127.0.0.1"
-        datetime.fromisoformat(record.timestamp)
+from __future__ import annotations  # Keep annotations as strings: no typing imports at collection time
+
+import io
+import json
+import os
+import logging
+import pytest
+
+from app.logger_module import (
+    setup_logging,
+    shutdown_logging,
+    setup_development_logging,
+    setup_production_logging,
+    setup_test_logging,
+    flush_logging,
+    get_logger,
+    get_structured_logger,
+    BufferedRotatingFileHandler,
+    ColoredFormatter,
+    FastRotatingFileHandler,
+    OrjsonFormatter,
+    StructuredLogger,
+)
+
+
+def _make_record(msg, level=logging.INFO, args=()):
+    """Build a bare LogRecord for driving handlers and formatters directly."""
+    return logging.LogRecord(
+        name="test",
+        level=level,
+        pathname="",
+        lineno=1,
+        msg=msg,
+        args=args,
+        exc_info=None,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _isolate_root_logger():
+    """
+    Snapshot and restore root-logger state around every test.
+
+    setup_logging swaps the root handlers wholesale; without cleanup each
+    test would leave its queue listener running and its handlers attached,
+    so later tests dispatch through an ever-growing handler list.
+    """
+    saved_handlers = list(logging.root.handlers)
+    saved_level = logging.root.level
+    saved_names = set(logging.Logger.manager.loggerDict)
+
+    yield
+
+    # Stop whichever listener the test's setup_logging left running, then
+    # restore the handler list and prune loggers the test created
+    shutdown_logging()
+    logging.root.handlers[:] = saved_handlers
+    logging.root.setLevel(saved_level)
+    manager = logging.Logger.manager
+    for name in set(manager.loggerDict) - saved_names:
+        manager.loggerDict.pop(name, None)
+
+
+@pytest.fixture
+def temp_log_file(tmp_path):
+    """Create a temporary log file path."""
+    return str(tmp_path / "app.tests_logs.log")
+
+
+@pytest.fixture(scope="session")
+def log_dir(tmp_path_factory):
+    """
+    One session-scoped directory for every log-file case.
+
+    Creating and tearing down a fresh tmp_path per case costs mkdir/rmtree
+    syscalls; the cases write distinct filenames, so they can safely share
+    a single directory.
+    """
+    return tmp_path_factory.mktemp("logs")
+
+
+@pytest.mark.parametrize(
+    "log_level,log_file,enable_colors,expect_file",
+    [
+        ("DEBUG", None, False, False),  # console only
+        ("DEBUG", "logs/test_app.log", False, True),  # with file
+    ],
+)
+def test_setup_logging_variants(capsys, log_dir, log_level, log_file, enable_colors, expect_file):
+    """Parameterized test for both console and file-based setups."""
+    # Distinct filename per case, so cases sharing the session directory
+    # never collide
+    candidate = str(log_dir / f"app_test_{'file' if log_file else 'console'}.log")
+    if log_file:
+        log_file = candidate
+
+    logger = setup_logging(
+        log_level=log_level,
+        log_file=log_file,
+        enable_colors=enable_colors,
+    )
+
+    logger.info("Test message")
+    flush_logging()  # handlers run on the listener thread
+    # capsys rides pytest's own capture machinery, so no manual StringIO
+    # swap of sys.stdout is needed
+    output = capsys.readouterr().out
+
+    assert "Test message" in output
+    assert "INFO" in output
+
+    if expect_file:
+        assert os.path.exists(candidate)
+        error_log = candidate.replace(".log", "_error.log")
+        assert os.path.exists(error_log)
+    else:
+        # no log file for console-only mode: the case's own candidate path
+        # must never have been created
+        assert not os.path.exists(candidate)
+
+
+def test_setup_logging_memory_handler():
+    """An injected in-memory handler replaces the file pair entirely."""
+    stream = io.StringIO()
+    logger = setup_logging(
+        log_level="DEBUG",
+        handler_factory=lambda: logging.StreamHandler(stream),
+    )
+
+    logger.info("Memory message")
+    flush_logging()  # handlers run on the listener thread
+
+    # The record reached the injected sink without touching the filesystem
+    assert "Memory message" in stream.getvalue()
+
+
+def test_setup_logging_closes_replaced_handlers(temp_log_file):
+    """Re-running setup closes the previous listener's handlers."""
+    handlers = []
+
+    def factory():
+        handler = BufferedRotatingFileHandler(temp_log_file)
+        handlers.append(handler)
+        return handler
+
+    setup_logging(log_level="INFO", handler_factory=factory, enable_colors=False)
+    setup_logging(log_level="INFO", enable_colors=False)
+
+    # FileHandler.close drops the stream reference once the file is closed,
+    # so a None stream means the swap released the descriptor
+    assert handlers[0].stream is None
+
+
+def test_orjson_formatter_builds_payload():
+    """Without a pre-serialized line the formatter builds the JSON itself."""
+    formatter = OrjsonFormatter()
+
+    # Plain record: the fallback dict carries the standard fields only
+    plain = json.loads(formatter.format(_make_record("plain %s", args=("message",))))
+    assert plain["msg"] == "plain message"
+    assert plain["lvl"] == "INFO"
+    assert plain["logger"] == "test"
+
+    # Structured context attached under 'context' is merged into the payload
+    record = _make_record("with context")
+    record.context = {"operation": "add", "result": 3}
+    merged = json.loads(formatter.format(record))
+    assert merged["operation"] == "add"
+    assert merged["result"] == 3
+
+
+def test_orjson_formatter_reuses_ndjson_line():
+    """A pre-serialized NDJSON line is returned verbatim, not rebuilt."""
+    formatter = OrjsonFormatter()
+    record = _make_record("ignored")
+    record.ndjson = b'{"msg": "pre-serialized"}'
+    assert formatter.format(record) == '{"msg": "pre-serialized"}'
+
+
+def test_fast_rotating_handler_rollover(tmp_path):
+    """The stream-position rollover check triggers without re-formatting."""
+    log_file = str(tmp_path / "fast.log")
+    handler = FastRotatingFileHandler(log_file, maxBytes=32, backupCount=1)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    try:
+        handler.emit(_make_record("x" * 48))
+        # The stream is past maxBytes, so the next record must rotate first
+        assert handler.shouldRollover(_make_record("next"))
+        handler.emit(_make_record("after rollover"))
+    finally:
+        handler.close()
+
+    assert os.path.exists(log_file + ".1")
+    with open(log_file) as fh:
+        assert "after rollover" in fh.read()
+
+
+def test_buffered_handler_rollover_and_close(tmp_path):
+    """Small maxBytes drives the handler through rollover, drain and close."""
+    log_file = str(tmp_path / "buffered.log")
+    handler = BufferedRotatingFileHandler(
+        log_file, maxBytes=64, backupCount=2, buffer_size=32
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+
+    # Each record exceeds buffer_size, so every emit drains to disk and the
+    # cached size crosses maxBytes after two records, forcing rollovers
+    for i in range(6):
+        handler.emit(_make_record(f"record {i} " + "x" * 30))
+    handler.close()
+
+    assert os.path.exists(log_file)
+    assert os.path.exists(log_file + ".1")
+    # Every record landed in exactly one of the rotated files
+    contents = ""
+    for suffix in ("", ".1", ".2"):
+        if os.path.exists(log_file + suffix):
+            with open(log_file + suffix) as fh:
+                contents += fh.read()
+    for i in range(6):
+        assert f"record {i} " in contents
+
+
+def test_buffered_handler_batches_until_flush(tmp_path):
+    """Records stay in memory until flush; an empty flush is a no-op."""
+    log_file = str(tmp_path / "batched.log")
+    # Large buffer and a long interval so nothing drains behind the test's back
+    handler = BufferedRotatingFileHandler(
+        log_file, buffer_size=8192, flush_interval=60.0
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    try:
+        handler.emit(_make_record("buffered line"))
+
+        # Still buffered: nothing has reached the file yet
+        with open(log_file) as fh:
+            assert fh.read() == ""
+
+        handler.flush()
+        with open(log_file) as fh:
+            assert "buffered line" in fh.read()
+
+        # Flushing again with an empty buffer must not write or raise
+        handler.flush()
+    finally:
+        handler.close()
+
+
+def test_buffered_handler_reopens_delayed_stream(tmp_path):
+    """With delay=True the first drain opens the stream on demand."""
+    log_file = str(tmp_path / "delayed.log")
+    handler = BufferedRotatingFileHandler(log_file, delay=True, buffer_size=1)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    try:
+        assert handler.stream is None
+        handler.emit(_make_record("first line"))
+        # The drain reopened the stream; flush pushes its io buffer to disk
+        handler.flush()
+        with open(log_file) as fh:
+            assert "first line" in fh.read()
+    finally:
+        handler.close()
+
+
+def test_buffered_handler_routes_format_errors(tmp_path):
+    """A record that fails to format goes to handleError, not the buffer."""
+    log_file = str(tmp_path / "bad.log")
+    handler = BufferedRotatingFileHandler(log_file, buffer_size=8192)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    # %d against a string raises inside format(); emit must swallow it
+    # via handleError instead of propagating
+    raise_exceptions = logging.raiseExceptions
+    logging.raiseExceptions = False
+    try:
+        handler.emit(_make_record("%d", args=("not a number",)))
+        handler.close()
+    finally:
+        logging.raiseExceptions = raise_exceptions
+
+    with open(log_file) as fh:
+        assert fh.read() == ""
+
+
+@pytest.fixture(scope="module")
+def env_logger(request):
+    """
+    Run one environment helper and memoize its logger per module.
+
+    With indirect parametrization each helper (the fixture param) executes
+    once per module rather than on every test invocation that needs it.
+    """
+    return request.param()
+
+
+@pytest.mark.parametrize(
+    "env_logger,expected_level",
+    [
+        (setup_development_logging, logging.DEBUG),
+        (setup_production_logging, logging.INFO),
+        (setup_test_logging, logging.WARNING),
+    ],
+    indirect=["env_logger"],
+)
+def test_environment_specific_loggers(env_logger, expected_level):
+    """Check that environment helper functions set correct log levels."""
+    assert env_logger.level == expected_level
+
+
+# One shared formatter and prebuilt records, assembled at import time so
+# the only work left inside each case is format() plus the substring check
+_COLOR_FORMATTER = ColoredFormatter("%(levelname)s: %(message)s")
+_COLOR_CASES = [
+    pytest.param(
+        logging.LogRecord(
+            name="test",
+            level=getattr(logging, levelname),
+            pathname="",
+            lineno=1,
+            msg=f"{levelname} message",
+            args=(),
+            exc_info=None,
+        ),
+        color_code,
+        levelname,
+        id=levelname,
+    )
+    for levelname, color_code in [
+        ("DEBUG", "\033[36m"),
+        ("INFO", "\033[32m"),
+        ("WARNING", "\033[33m"),
+        ("ERROR", "\033[31m"),
+        ("CRITICAL", "\033[35m"),
+    ]
+]
+
+
+@pytest.mark.skipif(
+    bool(os.environ.get("NO_COLOR")), reason="colors disabled via NO_COLOR"
+)
+@pytest.mark.parametrize("record,color_code,levelname", _COLOR_CASES)
+def test_colored_formatter_colors(record, color_code, levelname):
+    """Verify that each log level gets its correct color."""
+    formatted = _COLOR_FORMATTER.format(record)
+
+    assert color_code in formatted
+    assert f"{levelname} message" in formatted
+
+
+def test_get_logger_singleton_behavior():
+    """Ensure get_logger returns consistent logger instances."""
+    logger1 = get_logger("my.test.logger")
+    logger2 = get_logger("my.test.logger")
+    assert logger1 is logger2
+    assert isinstance(logger1, logging.Logger)
+
+
+def test_get_structured_logger_cached():
+    """Ensure get_structured_logger memoizes wrappers per logger name."""
+    structured1 = get_structured_logger("my.structured.logger")
+    structured2 = get_structured_logger("my.structured.logger")
+    assert structured1 is structured2
+    assert isinstance(structured1, StructuredLogger)
+
+
+@pytest.fixture(scope="module")
+def structured_loggers():
+    """
+    Build the StructuredLogger wrappers once per module.
+
+    logging.getLogger touches the manager dict under its lock; creating
+    the three wrappers up front keeps that out of each parametrized case.
+    """
+    return {
+        method: StructuredLogger(logging.getLogger(f"structured.{method}"))
+        for method in ("log_operation", "log_error", "log_request")
+    }
+
+
+@pytest.fixture(autouse=True)
+def _capture_structured(caplog):
+    """
+    Enable DEBUG capture for the structured.* loggers once per test.
+
+    Replaces the per-case caplog.at_level context manager; the assertions
+    filter by message content, and scoping the level to the 'structured'
+    parent leaves the root logger level (asserted elsewhere) untouched.
+    """
+    caplog.set_level(logging.DEBUG, logger="structured")
+
+
+@pytest.mark.parametrize(
+    "method,args,expected_text",
+    [
+        ("log_operation", ("add", 1, 2, 3, 12.5), "Operation completed: add"),
+        ("log_error", ("divide", "Division by zero", {"operand_a": 1, "operand_b": 0}), "Division by zero"),
+        ("log_request", ("GET", "/calc", "127.0.0.1", "pytest"), "Request received: GET /calc"),
+    ],
+)
+def test_structured_logger_methods(caplog, structured_loggers, method, args, expected_text):
+    """Parameterized test for StructuredLogger methods."""
+    structured = structured_loggers[method]
+
+    getattr(structured, method)(*args)
+
+    assert any(expected_text in m for m in caplog.messages)
+
+    record = caplog.records[0]
+    context = record.context
+    # record.created carries the timestamp; the context dict no longer
+    # duplicates it
+    assert record.created > 0
+
+    # basic field checks by method type
+    if method == "log_operation":
+        assert context["operation"] == "add"
+        assert context["result"] == 3
+    elif method == "log_error":
+        assert context["error"] == "Division by zero"
+        assert context["operand_a"] == 1
+    elif method == "log_request":
+        assert context["method"] == "GET"
+        assert context["path"] == "/calc"
+        assert context["client_ip"] == "127.0.0.1"
+
+
+def test_structured_logger_skips_disabled_levels(caplog):
+    """Each method returns before serializing when its level is disabled."""
+    quiet = StructuredLogger(logging.getLogger("structured.quiet"))
+    # CRITICAL shuts off both the INFO and ERROR paths
+    quiet.logger.setLevel(logging.CRITICAL)
+
+    quiet.log_operation("add", 1, 2, 3)
+    quiet.log_error("divide", "Division by zero")
+    quiet.log_request("GET", "/calc", "127.0.0.1")
+
+    assert not caplog.records